@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Optional, Any
+
+from .logging import get_logger
+
+LOGGER = get_logger(__name__)
+
+
+class _ConcurrencyLimiter:
+    """The slots of a concurrency limit with a bounded queue of the waiting requests."""
+
+    def __init__(self, limit: int, max_queue_size: int, max_queue_time: Optional[float], retry_after: int) -> None:
+        self.limit = limit
+        self.max_queue_size = max_queue_size
+        self.max_queue_time = max_queue_time
+        self.retry_after = retry_after
+        self.retry_after_header = (b'retry-after', str(retry_after).encode())
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_queue_time = 0
+        self._max_wait_time = 0.0
+
+    def _try_acquire(self) -> bool:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._admitted += 1
+            return True
+        return False
+
+    async def _wait(self) -> bool:
+        if len(self._waiters) >= self.max_queue_size or \
+                (self.max_queue_time is not None and self.max_queue_time <= 0):
+            self._rejected_queue_full += 1
+            return False
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        start_time = time.perf_counter()
+        timer = loop.call_later(self.max_queue_time, self._expire, waiter) \
+            if self.max_queue_time is not None else None
+        try:
+            admitted = await waiter
+        except asyncio.CancelledError:
+            # The slot may already be handed over to this request
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if not waiter.done():
+                waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+        wait_time = time.perf_counter() - start_time
+        if wait_time > self._max_wait_time:
+            self._max_wait_time = wait_time
+        if admitted:
+            self._admitted += 1
+        else:
+            self._rejected_queue_time += 1
+        return admitted
+
+    def release(self) -> None:
+        """Release the slot of an admitted request."""
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Hand over the free slots to the waiting requests in their arrival order
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(True)
+
+    @staticmethod
+    def _expire(waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_result(False)
+
+
+class AdmissionController(_ConcurrencyLimiter):
+    """
+    Adaptive admission control of the project requests.
+
+    The number of the requests handled concurrently is limited, and the limit is adapted to the event loop lag:
+    while the lag is above its target, the limit is decreased multiplicatively, and while it is below the target
+    and the limit is reached, the limit is increased by one. The requests that exceed the limit wait in a bounded
+    queue for a free slot for a limited time, and are rejected if the queue is full or their wait time exceeds the
+    limit. Also, if the event loop lag exceeds its maximum, all new requests are rejected until it recovers.
+    """
+
+    def __init__(
+            self,
+            max_concurrency: int,
+            min_concurrency: int = 1,
+            target_loop_lag: float = 0.05,
+            max_loop_lag: Optional[float] = None,
+            max_queue_size: int = 100,
+            max_queue_time: float = 0.5,
+            retry_after: int = 1,
+            exempt_paths: Optional[Iterable[str]] = None,
+            lag_interval: float = 0.1) -> None:
+        """
+        Initialize the admission controller.
+
+        :param max_concurrency: Maximum number of the requests handled concurrently (the upper bound of the limit)
+        :param min_concurrency: Minimum of the concurrency limit
+        :param target_loop_lag: Target of the event loop lag in seconds, which the concurrency limit is adapted to
+        :param max_loop_lag: Event loop lag in seconds above which all new requests are rejected
+                             (or None to disable)
+        :param max_queue_size: Maximum number of the requests waiting for a free slot
+        :param max_queue_time: Maximum time in seconds that a request waits for a free slot
+        :param retry_after: Value of the ``Retry-After`` header of the rejection responses in seconds
+        :param exempt_paths: List of the request paths (such as the health-check routes) that are always admitted
+        :param lag_interval: Interval of the event loop lag measurement in seconds
+        """
+        super().__init__(max_concurrency, max_queue_size, max_queue_time, retry_after)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min(min_concurrency, max_concurrency))
+        self.target_loop_lag = target_loop_lag
+        self.max_loop_lag = max_loop_lag
+        self.exempt_paths = frozenset(exempt_paths) if exempt_paths else frozenset()
+        self.lag_interval = lag_interval
+        self.loop_lag = 0.0
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._rejected_loop_lag = 0
+
+    @property
+    def is_started(self) -> bool:
+        return self._monitor_task is not None
+
+    @property
+    def is_saturated(self) -> bool:
+        """Whether the concurrency limit is reached or the event loop lag is above its target."""
+        return self._in_flight >= self.limit or self.loop_lag > self.target_loop_lag
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the admission metrics, including the current concurrency ``limit``, the number of the ``in_flight``
+        and ``queued`` requests, the last measured ``loop_lag`` and the ``max_wait_time`` of the queued requests
+        in seconds, the number of the ``admitted`` requests, and the number of the ``rejected`` requests in total
+        and by reason (``rejected_queue_full``, ``rejected_queue_time`` and ``rejected_loop_lag``).
+        """
+        return {'limit': self.limit,
+                'in_flight': self._in_flight,
+                'queued': len(self._waiters),
+                'loop_lag': self.loop_lag,
+                'max_wait_time': self._max_wait_time,
+                'admitted': self._admitted,
+                'rejected': self._rejected_queue_full + self._rejected_queue_time + self._rejected_loop_lag,
+                'rejected_queue_full': self._rejected_queue_full,
+                'rejected_queue_time': self._rejected_queue_time,
+                'rejected_loop_lag': self._rejected_loop_lag,
+                'max_concurrency': self.max_concurrency}
+
+    def is_exempt(self, path: str) -> bool:
+        return path in self.exempt_paths
+
+    def start(self) -> None:
+        """Start the event loop lag monitor."""
+        if self._monitor_task is None:
+            self._monitor_task = asyncio.ensure_future(self._monitor())
+
+    async def stop(self) -> None:
+        """Stop the event loop lag monitor."""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            await asyncio.gather(self._monitor_task, return_exceptions=True)
+            self._monitor_task = None
+
+    async def acquire(self) -> bool:
+        """Wait for a free slot of the concurrency limit and return whether the request is admitted.
+
+        Each admitted request must release its slot with :meth:`release`.
+        """
+        if self.max_loop_lag is not None and self.loop_lag > self.max_loop_lag:
+            self._rejected_loop_lag += 1
+            return False
+        return self._try_acquire() or await self._wait()
+
+    async def _monitor(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start_time = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag = max(0.0, loop.time() - start_time - self.lag_interval)
+            if self.loop_lag > self.target_loop_lag:
+                limit = max(self.min_concurrency, int(self.limit * 0.75))
+                if limit != self.limit:
+                    LOGGER.debug(f'Event loop lag is {self.loop_lag * 1000:.1f} ms, '
+                                 f'the concurrency limit is decreased to {limit}')
+                    self.limit = limit
+            elif self.limit < self.max_concurrency and self._in_flight >= self.limit:
+                self.limit += 1
+                self._wake()
+
+
+PRIORITIES = ('low', 'normal', 'high')
+
+
+class Bulkhead(_ConcurrencyLimiter):
+    """
+    A bulkhead that isolates the requests of a group of routes with its own concurrency limit and queue,
+    so that a slow group of routes cannot occupy all the resources of the process.
+
+    The priority class of the bulkhead decides which requests are shed first when the process is saturated
+    (see :attr:`~backendpy.admission.AdmissionController.is_saturated`): the requests of the ``low`` priority
+    bulkheads are rejected, the requests of the ``normal`` priority bulkheads are rejected if they cannot be
+    admitted without waiting in the queue, and the requests of the ``high`` priority bulkheads are handled as usual.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            max_concurrency: int,
+            max_queue_size: int = 0,
+            max_queue_time: Optional[float] = None,
+            priority: str = 'normal',
+            retry_after: int = 1) -> None:
+        """
+        Initialize the bulkhead.
+
+        :param name: The name of the bulkhead (used in the metrics)
+        :param max_concurrency: Maximum number of the requests of the bulkhead handled concurrently
+        :param max_queue_size: Maximum number of the requests waiting for a free slot of the bulkhead
+        :param max_queue_time: Maximum time in seconds that a request waits for a free slot (or None to wait
+                               until the request timeout)
+        :param priority: The priority class of the bulkhead (``low``, ``normal`` or ``high``)
+        :param retry_after: Value of the ``Retry-After`` header of the rejection responses in seconds
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f'Invalid bulkhead priority "{priority}"')
+        if max_concurrency < 1:
+            raise ValueError('The "max_concurrency" parameter must be positive.')
+        super().__init__(max_concurrency, max_queue_size, max_queue_time, retry_after)
+        self.name = name
+        self.priority = priority
+        self._rejected_shed = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the bulkhead metrics, including the number of the ``running`` and ``queued`` requests (the occupancy
+        of the bulkhead), the ``max_wait_time`` of the queued requests in seconds, the number of the ``admitted``
+        requests, the number of the ``rejected`` requests in total and by reason (``rejected_queue_full``,
+        ``rejected_queue_time`` and ``rejected_shed`` when the process is saturated), and the ``max_concurrency``,
+        ``max_queue_size`` and ``priority`` settings of the bulkhead.
+        """
+        return {'running': self._in_flight,
+                'queued': len(self._waiters),
+                'max_wait_time': self._max_wait_time,
+                'admitted': self._admitted,
+                'rejected': self._rejected_queue_full + self._rejected_queue_time + self._rejected_shed,
+                'rejected_queue_full': self._rejected_queue_full,
+                'rejected_queue_time': self._rejected_queue_time,
+                'rejected_shed': self._rejected_shed,
+                'max_concurrency': self.limit,
+                'max_queue_size': self.max_queue_size,
+                'priority': self.priority}
+
+    async def acquire(self, saturated: bool = False) -> bool:
+        """Wait for a free slot of the bulkhead and return whether the request is admitted.
+
+        Each admitted request must release its slot with :meth:`release`.
+
+        :param saturated: Whether the process is saturated
+        """
+        if saturated and self.priority == 'low':
+            self._rejected_shed += 1
+            return False
+        if self._try_acquire():
+            return True
+        if saturated and self.priority == 'normal':
+            self._rejected_shed += 1
+            return False
+        return await self._wait()
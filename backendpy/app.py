@@ -3,9 +3,12 @@ from __future__ import annotations
 from collections.abc import Iterable, Mapping
 from typing import Any, Optional
 
+from .admission import Bulkhead
 from .error import ErrorList
 from .hook import Hooks
 from .router import Routes
+from .scheduler import Scheduler
+from .threadpool import to_async
 
 
 class App:
@@ -19,6 +22,11 @@ class App:
                          from which templates will be searched (or None)
     :ivar errors: Iterable of instances of the ErrorList class (or None)
     :ivar init_func: The initialization function of the application (or None)
+    :ivar hosts: Iterable of host patterns that the application routes are bound to (or None)
+    :ivar mounts: Mapping of path prefixes to the ASGI applications mounted under them (or None)
+    :ivar middlewares: Mapping of path prefixes to the middlewares that are only executed for their routes (or None)
+    :ivar schedulers: Iterable of instances of the Scheduler class (or None)
+    :ivar bulkhead: The bulkhead of the application routes (or None)
     """
 
     def __init__(
@@ -28,7 +36,12 @@ class App:
             models: Optional[Iterable[str]] = None,
             template_dirs: Optional[Iterable[str]] = None,
             errors: Optional[Iterable[ErrorList]] = None,
-            init_func: Optional[callable[[Mapping], Any]] = None):
+            init_func: Optional[callable[[Mapping], Any]] = None,
+            hosts: Optional[Iterable[str]] = None,
+            mounts: Optional[Mapping[str, callable]] = None,
+            middlewares: Optional[Mapping[str, Iterable[Any]]] = None,
+            schedulers: Optional[Iterable[Scheduler]] = None,
+            bulkhead: Optional[Bulkhead] = None):
         """
         Initialize application instance
 
@@ -38,11 +51,26 @@ class App:
         :param template_dirs: Iterable of paths (within the application directory)
                               from which templates will be searched (or None)
         :param errors: Iterable of instances of the ErrorList class (or None)
-        :param init_func: The initialization function of the application (or None)
+        :param init_func: The initialization function of the application (or None). Synchronous
+                          functions are executed in the project thread pool.
+        :param hosts: Iterable of host patterns (exact hosts like ``example.com`` or wildcard subdomains
+                      like ``*.example.com``) that the application routes are bound to (or None)
+        :param mounts: Mapping of path prefixes to the ASGI applications mounted under them (or None)
+                       (see :func:`~backendpy.router.Routes.mount`)
+        :param middlewares: Mapping of path prefixes to the middlewares (classes, instances or their dotted
+                            paths) that are only executed for the routes under them (or None)
+        :param schedulers: Iterable of instances of the Scheduler class that contain the periodic jobs (or None)
+        :param bulkhead: The :class:`~backendpy.admission.Bulkhead` that is shared between the application routes
+                         without their own bulkhead or the bulkhead of their routes group (or None)
         """
         self.routes = routes
         self.hooks = hooks
         self.models = models
         self.template_dirs = template_dirs
         self.errors = errors
-        self.init_func = init_func
+        self.init_func = to_async(init_func) if init_func is not None else None
+        self.hosts = hosts
+        self.mounts = mounts
+        self.middlewares = middlewares
+        self.schedulers = schedulers
+        self.bulkhead = bulkhead
@@ -1,29 +1,41 @@
 from __future__ import annotations
 
+import asyncio
 import importlib
 import inspect
 import os
+import re
 import sys
+import time
 from collections.abc import Mapping
 from contextvars import ContextVar
 from pathlib import Path
 from typing import Optional, Any
+from urllib.parse import unquote_to_bytes
 
+from .admission import AdmissionController
 from .app import App
+from .background import BackgroundTaskQueue
 from .config import get_config
 from .error import Error, base_errors
 from .exception import ExceptionResponse
 from .hook import HookRunner
 from .logging import get_logger
 from .middleware.middleware import MiddlewareProcessor
-from .request import Request
+from .request import Request, DisconnectWatcher
 from .router import Router
+from .scheduler import SchedulerRunner, get_default_lock_path
+from .processpool import ProcessPool, set_process_pool
+from .threadpool import ThreadPool, set_thread_pool
 from .templating import Template
 from .utils.bytes import to_bytes
 
 
 LOGGER = get_logger(__name__)
 
+# A host name or an IPv4 address or a bracketed IPv6 address, with an optional port
+HOST_PATTERN = re.compile(rb'([a-z0-9.\-_]+|\[[a-f0-9]*:[a-f0-9.:]+\])(:[0-9]{1,5})?')
+
 
 class Backendpy:
     """The Backendpy ASGI handler"""
@@ -37,59 +49,115 @@ class Backendpy:
 
     def __init__(self):
         """Initialize Backendpy class instance."""
+        boot_start_time = time.perf_counter()
         self.config = get_config(project_path=self._get_project_path(), error_logs=True)
         self.context = dict()
         self._request_context_var = ContextVar('request')
+        self._thread_pool = ThreadPool(
+            max_workers=int(self.config['thread_pool'].get('max_workers', 0)) or None)
+        set_thread_pool(self._thread_pool)
+        self._process_pool = ProcessPool(
+            max_workers=int(self.config['process_pool'].get('max_workers', 0)) or None,
+            max_tasks_per_child=int(self.config['process_pool'].get('max_tasks_per_child', 0)) or None,
+            shared_memory_threshold=int(self.config['process_pool'].get('shared_memory_threshold', 1024 * 1024)))
+        set_process_pool(self._process_pool)
         self._hook_runner = HookRunner()
-        self._router = Router()
+        self._router = Router(
+            cache_size=int(self.config['networking'].get('route_cache_size', 0)),
+            not_found_cache_size=int(self.config['networking'].get('route_not_found_cache_size', 0)))
         self._middleware_processor = MiddlewareProcessor(
             paths=self.config['middlewares']['active'])
+        self._scheduler_runner = SchedulerRunner(
+            lock_path=self.config['scheduler'].get('lock_path') or
+            get_default_lock_path(self.config['environment']['project_path']))
+        self._background_tasks = BackgroundTaskQueue(
+            max_size=int(self.config['background_tasks'].get('queue_size', 1000)),
+            workers=int(self.config['background_tasks'].get('workers', 10)))
         self.errors = base_errors
+        self._lazy_apps = self._get_lazy_apps()
         self._project_apps = self._get_project_apps()
         for app_data in self._project_apps:
-            if app_data['app'].routes:
-                for i in app_data['app'].routes:
-                    self._router.extend(i.items)
-            if app_data['app'].hooks:
-                for i in app_data['app'].hooks:
-                    self._hook_runner.hooks.merge(i)
-            if app_data['app'].errors:
-                for i in app_data['app'].errors:
-                    self.errors.merge(i)
-            if app_data['app'].template_dirs:
-                Template.template_dirs[app_data['path']] = \
-                    [Path(app_data['path']).joinpath(p) for p in app_data['app'].template_dirs]
+            self._add_app(app_data)
+        self._router.compile()
+        self._hook_runner.compile()
+        self._middleware_processor.compile()
         self._lifespan_startup = False
+        self._startup_lock: Optional[asyncio.Lock] = None
+        self._all_hosts_allowed, self._allowed_hosts, self._allowed_host_suffixes = self._compile_allowed_hosts()
+        self._cancel_on_disconnect = self.config['networking'].get('cancel_on_disconnect') == 'true'
+        self._request_stats = {'cancelled': 0, 'rejected_overload': 0, 'rejected_shutdown': 0}
+        self._admission_controller = self._get_admission_controller()
+        self._in_flight_requests: set[Request] = set()
+        self._shutting_down = False
+        self._drained: Optional[asyncio.Event] = None
+        self._shutdown_grace_period = float(self.config['networking'].get('shutdown_grace_period', 30))
+        self._request_timeout = float(self.config['networking']['request_timeout']) \
+            if self.config['networking'].get('request_timeout') else None
+        self._timeout_header = self.config['networking']['timeout_header'].lower() \
+            if self.config['networking'].get('timeout_header') else None
+        self.boot_time: float = time.perf_counter() - boot_start_time
+        self.lazy_load_times: dict[str, float] = dict()
+        LOGGER.info(f'Boot time: {self.boot_time * 1000:.1f} ms'
+                    f'{f" ({len(self._lazy_apps)} lazy apps not loaded)" if self._lazy_apps else ""}')
 
     async def __call__(self, scope, receive, send):
         """Receive the requests and return the responses."""
         if scope['type'] == 'http':
             if not self._lifespan_startup:
+                # The server has not sent the lifespan events
                 try:
-                    await self.execute_event('startup')
+                    await self._startup()
                 except Exception as e:
                     LOGGER.exception(e)
-                else:
-                    self._lifespan_startup = True
+
+            if not self._is_allowed_host(scope['headers']):
+                try:
+                    request = Request(app=self, scope=scope, body_receiver=receive)
+                except Exception as e:
+                    raise RuntimeError(f'Request instance creation error: {e}')
+                response = Error(1003)
+                await self._send_response(send, *await response(request))
+                return
+
+            if self._lazy_apps:
+                await self._load_lazy_apps(scope['path'])
+
+            mount = self._router.match_mount(scope['path']) if self._router.has_mounts else None
+            watcher = DisconnectWatcher(receive) if self._cancel_on_disconnect and mount is None else None
             try:
-                request = Request(app=self, scope=scope, body_receiver=receive)
+                request = Request(app=self, scope=scope,
+                                  body_receiver=watcher.receive if watcher is not None else receive)
             except Exception as e:
                 raise RuntimeError(f'Request instance creation error: {e}')
 
-            if '*' not in self.config['networking']['allowed_hosts'] and \
-                    ((not request.headers.get('host') or
-                     request.headers['host'] not in self.config['networking']['allowed_hosts']) or
-                     (request.headers.get('x-forwarded-host') and
-                      request.headers['x-forwarded-host'] not in self.config['networking']['allowed_hosts'])):
-                response = Error(1003)
+            if self._shutting_down:
+                # New requests are not admitted while the in-flight requests are drained
+                self._request_stats['rejected_shutdown'] += 1
+                response = Error(1006, headers=[(b'connection', b'close')])
                 await self._send_response(send, *await response(request))
                 return
 
-            token = self._request_context_var.set(request)
-            await self.execute_event('request_start')
-            await self._send_response(send, *await self._get_response(request))
-            await self.execute_event('request_end')
-            self._request_context_var.reset(token)
+            self._in_flight_requests.add(request)
+            try:
+                if mount is not None:
+                    await self._call_mounted_app(scope, receive, send, *mount)
+                elif self._admission_controller is not None and \
+                        not self._admission_controller.is_exempt(request.path):
+                    if not await self._admission_controller.acquire():
+                        self._request_stats['rejected_overload'] += 1
+                        response = Error(1006, headers=[self._admission_controller.retry_after_header])
+                        await self._send_response(send, *await response(request))
+                        return
+                    try:
+                        await self._handle_request(request, send, watcher)
+                    finally:
+                        self._admission_controller.release()
+                else:
+                    await self._handle_request(request, send, watcher)
+            finally:
+                self._in_flight_requests.discard(request)
+                if self._drained is not None and not self._in_flight_requests:
+                    self._drained.set()
 
         elif scope['type'] == 'websocket':
             # TODO
@@ -98,16 +166,81 @@ class Backendpy:
         elif scope['type'] == 'lifespan':
             await self._handle_lifespan(receive, send)
 
+    @property
+    def router(self) -> Router:
+        """Return the project router (e.g. to read its lookup cache statistics)."""
+        return self._router
+
+    @property
+    def request_stats(self) -> dict[str, int]:
+        """Return the request handling statistics (the number of the requests cancelled by client disconnection,
+        rejected by the admission control because of overload and rejected during the shutdown)."""
+        return self._request_stats
+
+    @property
+    def admission_controller(self) -> Optional[AdmissionController]:
+        """Return the admission controller of the project if it is enabled (e.g. to read its metrics and limits)."""
+        return self._admission_controller
+
+    @property
+    def bulkhead_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the metrics of the route bulkheads keyed by the bulkhead names.
+
+        .. seealso:: :attr:`~backendpy.admission.Bulkhead.stats`
+        """
+        return {bulkhead.name: bulkhead.stats for bulkhead in self._router.bulkheads}
+
+    @property
+    def thread_pool(self) -> ThreadPool:
+        """Return the thread pool of the synchronous handlers and hooks (e.g. to read its metrics)."""
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> ProcessPool:
+        """Return the process pool of the CPU bound functions (e.g. to read its metrics)."""
+        return self._process_pool
+
+    async def run_cpu(self, func: callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a CPU bound function in the project process pool and return its result.
+
+        .. seealso:: :func:`~backendpy.processpool.ProcessPool.run`
+        """
+        return await self._process_pool.run(func, *args, **kwargs)
+
+    @property
+    def background_tasks(self) -> BackgroundTaskQueue:
+        """Return the background tasks queue of the project (e.g. to read its metrics)."""
+        return self._background_tasks
+
+    @property
+    def scheduler_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the statistics of the periodic jobs.
+
+        .. seealso:: :attr:`~backendpy.scheduler.SchedulerRunner.stats`
+        """
+        return self._scheduler_runner.stats
+
     def get_current_request(self):
         """Return the current request object."""
         return self._request_context_var.get()
 
-    def event(self, name: str) -> callable:
+    def event(self, name: str, concurrent: bool = False, timeout: Optional[float] = None) -> callable:
         """Register an event hook with python decorator.
 
         .. seealso:: :func:`~backendpy.hook.Hooks.event`
         """
-        return self._hook_runner.hooks.event(name)
+        def decorator_register(func: callable) -> None:
+            self._hook_runner.hooks.register(name, func, concurrent, timeout)
+            self._hook_runner.compile()
+        return decorator_register
+
+    @property
+    def hook_stats(self) -> dict[tuple[str, str], dict[str, Any]]:
+        """Return the execution statistics of the concurrent hooks.
+
+        .. seealso:: :attr:`~backendpy.hook.HookRunner.stats`
+        """
+        return self._hook_runner.stats
 
     async def execute_event(self, name: str, args: Optional[Mapping[str, Any]] = None) -> None:
         """Trigger all hooks related to the event.
@@ -117,34 +250,111 @@ class Backendpy:
         """
         return await self._hook_runner.trigger(name, args)
 
+    async def _startup(self):
+        # The lock is created here to be bound to the running event loop
+        if self._startup_lock is None:
+            self._startup_lock = asyncio.Lock()
+        async with self._startup_lock:
+            if self._lifespan_startup:
+                # Started by a concurrent request
+                return
+            await self.execute_event('startup')
+            self._lifespan_startup = True
+            self._background_tasks.start()
+            self._process_pool.start()
+            await self._scheduler_runner.start()
+            if self._admission_controller is not None:
+                self._admission_controller.start()
+
     async def _handle_lifespan(self, receive, send):
         while True:
             message = await receive()
             if message['type'] == 'lifespan.startup':
                 try:
-                    await self.execute_event('startup')
+                    await self._startup()
                 except Exception as e:
                     LOGGER.exception(e)
                     await send({'type': 'lifespan.startup.failed',
                                 'message': str(e)})
                 else:
-                    self._lifespan_startup = True
                     await send({'type': 'lifespan.startup.complete'})
             elif message['type'] == 'lifespan.shutdown':
                 try:
+                    self._shutting_down = True
+                    await self._scheduler_runner.stop()
+                    await self._drain()
+                    if self._admission_controller is not None:
+                        await self._admission_controller.stop()
                     await self.execute_event('shutdown')
                 except Exception as e:
                     LOGGER.exception(e)
                     await send({'type': 'lifespan.shutdown.failed',
                                 'message': str(e)})
                 else:
+                    self._thread_pool.shutdown()
+                    self._process_pool.stop()
                     await send({'type': 'lifespan.shutdown.complete'})
                     return
 
+    async def _drain(self):
+        """Wait for the in-flight requests and then the background tasks until the shutdown grace period ends."""
+        deadline = time.monotonic() + self._shutdown_grace_period
+        if self._in_flight_requests:
+            LOGGER.info(f'Waiting for {len(self._in_flight_requests)} in-flight requests')
+            self._drained = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._drained.wait(), self._shutdown_grace_period)
+            except asyncio.TimeoutError:
+                LOGGER.warning(f'{len(self._in_flight_requests)} in-flight requests were cut off: ' +
+                               ', '.join(f'"{r.method} {r.path}"' for r in self._in_flight_requests))
+        drain_timeout = self.config['background_tasks'].get('drain_timeout')
+        timeout = max(0.0, deadline - time.monotonic())
+        if drain_timeout:
+            timeout = min(timeout, float(drain_timeout))
+        await self._background_tasks.stop(timeout=timeout)
+
+    async def _handle_request(self, request, send, watcher):
+        token = self._request_context_var.set(request)
+        queued = 0
+        try:
+            if self._hook_runner.has_hooks('request_start'):
+                await self.execute_event('request_start')
+            if watcher is None:
+                await self._send_response(send, *await self._get_response(request))
+            else:
+                # Handle the request in a separate task that is cancelled if the client disconnects
+                task = asyncio.ensure_future(self._respond(request, send))
+                watcher.start(task.cancel)
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    if not watcher.disconnected:
+                        raise
+                    self._request_stats['cancelled'] += 1
+                    LOGGER.debug(f'Request "{request.method} {request.path}" is cancelled (client disconnected)')
+                finally:
+                    watcher.stop()
+            if request._background_tasks:
+                for coro in request._background_tasks:
+                    await self._background_tasks.put(coro)
+                    queued += 1
+            if self._hook_runner.has_hooks('request_end'):
+                await self.execute_event('request_end')
+        finally:
+            if request._background_tasks and queued < len(request._background_tasks):
+                # The request failed, so the tasks that are not queued are never executed
+                for coro in request._background_tasks[queued:]:
+                    coro.close()
+            self._request_context_var.reset(token)
+
     async def _get_response(self, request):
+        route_middleware_processor = None
         # Execute request middlewares
         try:
-            request, response = await self._middleware_processor.run_process_request(request=request)
+            if self._middleware_processor.request_processors:
+                request, response = await self._middleware_processor.run_process_request(request=request)
+            else:
+                response = None
         except Exception as e:
             LOGGER.exception(f'Request middleware error: {e}')
             response = Error(1000)
@@ -152,40 +362,42 @@ class Backendpy:
             if not response:
                 # Routing request
                 try:
-                    handler, request._data_handler, request.url_vars = \
-                        self._router.lookup(request.path, request.method, request.scheme)
+                    route, request.url_vars, allow = \
+                        self._router.resolve(request.path, request.method, request.scheme,
+                                             request.headers.get('host'))
                 except Exception as e:
                     LOGGER.exception(e)
                     response = Error(1000)
                 else:
-                    if not handler:
-                        response = Error(1001)
+                    if route is None:
+                        response = Error(1004, headers=[[b'allow', allow]]) if allow else Error(1001)
                     else:
-                        # Execute handler middlewares
-                        try:
-                            handler = await self._middleware_processor.run_process_handler(
-                                request=request,
-                                handler=handler)
-                        except ExceptionResponse as e:
-                            response = e
-                        except Exception as e:
-                            LOGGER.exception(f'Handler middleware error: {e}')
-                            response = Error(1000)
+                        request._data_handler = route['data_handler']
+                        route_middleware_processor = route['middleware_processor']
+                        timeout = self._get_request_timeout(request, route)
+                        if timeout is None:
+                            request, response = await self._get_route_response(request, route)
                         else:
-                            # Get response from handler
+                            # Apply the time budget of the request to the route middlewares and handler
+                            request.deadline = time.monotonic() + timeout
                             try:
-                                response = await handler(request=request)
-                            except ExceptionResponse as e:
-                                response = e
-                            except Exception as e:
-                                LOGGER.exception(f'Handler error: {e}')
-                                response = Error(1000)
-
-        # Execute response middlewares
+                                request, response = await asyncio.wait_for(
+                                    self._get_route_response(request, route), timeout)
+                            except asyncio.TimeoutError:
+                                LOGGER.warning(f'Request "{request.method} {request.path}" '
+                                               f'timed out after {timeout} seconds')
+                                response = Error(1005)
+
+        # Execute response middlewares (of the route and then of the project)
         try:
-            response = await self._middleware_processor.run_process_response(
-                request=request,
-                response=response)
+            if route_middleware_processor is not None and route_middleware_processor.response_processors:
+                response = await route_middleware_processor.run_process_response(
+                    request=request,
+                    response=response)
+            if self._middleware_processor.response_processors:
+                response = await self._middleware_processor.run_process_response(
+                    request=request,
+                    response=response)
         except ExceptionResponse as r:
             response = r
         except Exception as e:
@@ -194,26 +406,101 @@ class Backendpy:
 
         # Execute hooks
         if isinstance(response, ExceptionResponse):
-            await self.execute_event('exception_response')
-        else:
+            if self._hook_runner.has_hooks('exception_response'):
+                await self.execute_event('exception_response')
+        elif self._hook_runner.has_hooks('success_response'):
             await self.execute_event('success_response')
 
         # Call and return response instance
         return await response(request)
 
+    def _get_request_timeout(self, request, route):
+        timeout = route['timeout'] if route['timeout'] is not None else self._request_timeout
+        if self._timeout_header is not None:
+            value = request.headers.get(self._timeout_header)
+            if value:
+                try:
+                    header_timeout = float(value)
+                except ValueError:
+                    pass
+                else:
+                    # The requested time budget can only shorten the timeout
+                    if header_timeout > 0 and (timeout is None or header_timeout < timeout):
+                        timeout = header_timeout
+        return timeout
+
+    async def _get_route_response(self, request, route):
+        bulkhead = route['bulkhead']
+        if bulkhead is None:
+            return await self._get_admitted_route_response(request, route)
+        saturated = self._admission_controller is not None and self._admission_controller.is_saturated
+        if not await bulkhead.acquire(saturated):
+            return request, Error(1006, headers=[bulkhead.retry_after_header])
+        try:
+            return await self._get_admitted_route_response(request, route)
+        finally:
+            bulkhead.release()
+
+    async def _get_admitted_route_response(self, request, route):
+        response = None
+        route_middleware_processor = route['middleware_processor']
+        # Execute request middlewares of the route
+        if route_middleware_processor is not None and route_middleware_processor.request_processors:
+            try:
+                request, response = await route_middleware_processor.run_process_request(request=request)
+            except Exception as e:
+                LOGGER.exception(f'Request middleware error: {e}')
+                response = Error(1000)
+        if not response:
+            response = await self._get_handler_response(request, route['handler'], route_middleware_processor)
+        return request, response
+
+    async def _get_handler_response(self, request, handler, route_middleware_processor):
+        # Execute handler middlewares (of the project and then of the route)
+        try:
+            if self._middleware_processor.handler_processors:
+                handler = await self._middleware_processor.run_process_handler(
+                    request=request,
+                    handler=handler)
+            if route_middleware_processor is not None and route_middleware_processor.handler_processors:
+                handler = await route_middleware_processor.run_process_handler(
+                    request=request,
+                    handler=handler)
+        except ExceptionResponse as e:
+            return e
+        except Exception as e:
+            LOGGER.exception(f'Handler middleware error: {e}')
+            return Error(1000)
+        # Get response from handler
+        try:
+            return await handler(request=request)
+        except ExceptionResponse as e:
+            return e
+        except Exception as e:
+            LOGGER.exception(f'Handler error: {e}')
+            return Error(1000)
+
+    async def _respond(self, request, send):
+        await self._send_response(send, *await self._get_response(request))
+
     @staticmethod
     async def _send_response(send, body, status, headers, stream=False):
         await send({
             'type': 'http.response.start',
             'status': status,
-            'headers': [(name.lower(), value) for name, value in headers]})
+            'headers': headers})
         if stream:
             if hasattr(body, '__aiter__'):
-                async for chunk in body:
-                    await send({
-                        'type': 'http.response.body',
-                        'body': to_bytes(chunk),
-                        'more_body': True})
+                try:
+                    async for chunk in body:
+                        await send({
+                            'type': 'http.response.body',
+                            'body': to_bytes(chunk),
+                            'more_body': True})
+                finally:
+                    # Close the generator if the streaming is interrupted (e.g. the client is disconnected)
+                    if hasattr(body, 'aclose'):
+                        await body.aclose()
             else:
                 for chunk in body:
                     await send({
@@ -230,21 +517,180 @@ class Backendpy:
 
     def _get_project_apps(self):
         apps: list[dict] = list()
+        lazy_package_names = {i['package_name'] for i in self._lazy_apps}
         for package_name in self.config['apps']['active']:
-            try:
-                module = importlib.import_module(f'{package_name}.main')
-                app = getattr(module, 'app')
-                if isinstance(app, App):
-                    apps.append(dict(
-                        package_name=package_name,
-                        path=os.path.dirname(os.path.abspath(module.__file__)),
-                        app=app))
-                else:
-                    LOGGER.error(f'"{package_name}" app instance error')
-            except (ImportError, AttributeError):
-                LOGGER.error(f'"{package_name}" app instance import error')
+            if package_name not in lazy_package_names:
+                app_data = self._import_app(package_name)
+                if app_data is not None:
+                    apps.append(app_data)
         return apps
 
+    @staticmethod
+    def _import_app(package_name):
+        try:
+            module = importlib.import_module(f'{package_name}.main')
+            app = getattr(module, 'app')
+            if isinstance(app, App):
+                return dict(
+                    package_name=package_name,
+                    path=os.path.dirname(os.path.abspath(module.__file__)),
+                    app=app)
+            else:
+                LOGGER.error(f'"{package_name}" app instance error')
+        except (ImportError, AttributeError):
+            LOGGER.error(f'"{package_name}" app instance import error')
+        return None
+
+    def _add_app(self, app_data):
+        if app_data['app'].routes:
+            for i in app_data['app'].routes:
+                self._router.extend(i, hosts=app_data['app'].hosts, bulkhead=app_data['app'].bulkhead)
+        if app_data['app'].mounts:
+            for prefix, app in app_data['app'].mounts.items():
+                self._router.mount(prefix, app)
+        if app_data['app'].middlewares:
+            for prefix, middlewares in app_data['app'].middlewares.items():
+                self._router.add_middlewares(prefix, middlewares)
+        if app_data['app'].hooks:
+            for i in app_data['app'].hooks:
+                self._hook_runner.hooks.merge(i)
+        if app_data['app'].schedulers:
+            for i in app_data['app'].schedulers:
+                self._scheduler_runner.scheduler.merge(i)
+        if app_data['app'].errors:
+            for i in app_data['app'].errors:
+                self.errors.merge(i)
+        if app_data['app'].template_dirs:
+            Template.template_dirs[app_data['path']] = \
+                [Path(app_data['path']).joinpath(p) for p in app_data['app'].template_dirs]
+
+    def _get_admission_controller(self):
+        config = self.config['admission']
+        if not config.get('max_concurrency'):
+            return None
+        exempt_paths = config.get('exempt_paths')
+        return AdmissionController(
+            max_concurrency=int(config['max_concurrency']),
+            min_concurrency=int(config.get('min_concurrency', 1)),
+            target_loop_lag=float(config.get('target_loop_lag', 0.05)),
+            max_loop_lag=float(config['max_loop_lag']) if config.get('max_loop_lag') else None,
+            max_queue_size=int(config.get('max_queue_size', 100)),
+            max_queue_time=float(config.get('max_queue_time', 0.5)),
+            retry_after=int(config.get('retry_after', 1)),
+            exempt_paths=(exempt_paths,) if type(exempt_paths) is str else exempt_paths)
+
+    def _compile_allowed_hosts(self):
+        """
+        Compile the ``allowed_hosts`` config into a set of the exact hosts and a tuple of the suffixes of the
+        wildcard subdomain patterns (such as ``*.example.com``), which are matched with the raw header values.
+        """
+        allowed_hosts = self.config['networking']['allowed_hosts']
+        exact_hosts, suffixes = set(), list()
+        for host in allowed_hosts:
+            host = host.strip().lower().encode()
+            if host.startswith(b'*.'):
+                suffixes.append(host[1:])
+            else:
+                exact_hosts.add(host)
+        return '*' in allowed_hosts, frozenset(exact_hosts), tuple(suffixes)
+
+    def _is_allowed_host(self, headers):
+        if self._all_hosts_allowed:
+            return True
+        host = forwarded_host = None
+        for name, value in headers:
+            if name == b'host':
+                host = value
+            elif name == b'x-forwarded-host':
+                forwarded_host = value
+        return bool(host) and self._match_host(host) and \
+            (not forwarded_host or self._match_host(forwarded_host))
+
+    def _match_host(self, host):
+        host = host.lower()
+        if host in self._allowed_hosts:
+            return True
+        if self._allowed_host_suffixes and HOST_PATTERN.fullmatch(host) is not None:
+            # The host is validated so that only its name can match the suffixes
+            if host.endswith(self._allowed_host_suffixes):
+                return True
+            if not host.endswith(b']') and b':' in host:
+                # Match the patterns without port with the host without its port
+                return host.rsplit(b':', 1)[0].endswith(self._allowed_host_suffixes)
+        return False
+
+    @staticmethod
+    async def _call_mounted_app(scope, receive, send, prefix, app):
+        path = scope['path'][len(prefix):] or '/'
+        mounted_scope = dict(scope)
+        mounted_scope['root_path'] = scope.get('root_path', '') + prefix
+        mounted_scope['path'] = path
+        if scope.get('raw_path'):
+            # Remove the prefix from the original (percent-encoded) path
+            raw_path = scope['raw_path']
+            raw_prefix = prefix.encode()
+            index = 0
+            while True:
+                index = raw_path.find(b'/', index + 1)
+                end = index if index >= 0 else len(raw_path)
+                if unquote_to_bytes(raw_path[:end]) == raw_prefix:
+                    mounted_scope['raw_path'] = raw_path[end:] or b'/'
+                    break
+                if index < 0:
+                    mounted_scope['raw_path'] = path.encode()
+                    break
+        await app(mounted_scope, receive, send)
+
+    def _get_lazy_apps(self):
+        """
+        Return the list of the apps that are loaded on the first request under their route prefixes.
+        Each line of the ``lazy`` option in the ``apps`` config section contains an active app
+        package name followed by its route prefixes (e.g. ``myproject.apps.shop /shop /api/shop``).
+        """
+        lazy_apps: list[dict] = list()
+        for line in self.config['apps']['lazy']:
+            package_name, *prefixes = line.split()
+            if package_name not in self.config['apps']['active']:
+                LOGGER.error(f'"{package_name}" lazy app is not active')
+            elif not prefixes:
+                LOGGER.error(f'"{package_name}" lazy app route prefixes are not specified')
+            else:
+                lazy_apps.append(dict(
+                    package_name=package_name,
+                    prefixes=tuple('/' + p.strip('/') for p in prefixes),
+                    lock=None))
+        return lazy_apps
+
+    async def _load_lazy_apps(self, path):
+        for lazy_app in tuple(self._lazy_apps):
+            if any(path == p or path.startswith(p + '/') or p == '/' for p in lazy_app['prefixes']):
+                await self._load_lazy_app(lazy_app)
+
+    async def _load_lazy_app(self, lazy_app):
+        if lazy_app['lock'] is None:
+            lazy_app['lock'] = asyncio.Lock()
+        async with lazy_app['lock']:
+            if lazy_app not in self._lazy_apps:
+                # Loaded by a concurrent request
+                return
+            start_time = time.perf_counter()
+            app_data = self._import_app(lazy_app['package_name'])
+            # The app is not loaded again if its startup hooks fail
+            self._lazy_apps.remove(lazy_app)
+            if app_data is not None:
+                self._add_app(app_data)
+                self._project_apps.append(app_data)
+                self._router.compile()
+                self._hook_runner.compile()
+                if self._lifespan_startup and app_data['app'].hooks:
+                    # The startup event is already triggered for the other apps
+                    await self._hook_runner.trigger('startup', hooks=app_data['app'].hooks)
+                if self._lifespan_startup:
+                    await self._scheduler_runner.start()
+            self.lazy_load_times[lazy_app['package_name']] = time.perf_counter() - start_time
+            LOGGER.info(f'"{lazy_app["package_name"]}" app lazy loading time (added to its first request): '
+                        f'{self.lazy_load_times[lazy_app["package_name"]] * 1000:.1f} ms')
+
     @staticmethod
     def _get_project_path():
         return os.path.dirname(os.path.realpath(inspect.stack()[2].filename))
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Optional
+
+from .logging import get_logger
+
+LOGGER = get_logger(__name__)
+
+
+class BackgroundTaskQueue:
+    """
+    A bounded queue of background tasks which is drained by a limited number of worker tasks.
+
+    When the queue is full, adding a task waits until there is free space in the queue. After the queue is
+    stopped, the added tasks are rejected.
+    """
+
+    def __init__(self, max_size: int = 1000, workers: int = 10) -> None:
+        """
+        Initialize the queue.
+
+        :param max_size: Maximum number of the tasks waiting in the queue
+        :param workers: Number of the worker tasks (maximum number of the tasks executed concurrently)
+        """
+        self.max_size = max_size
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: list[asyncio.Task] = list()
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._max_depth = 0
+        self._stopped = False
+
+    @property
+    def is_started(self) -> bool:
+        return bool(self._worker_tasks)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Get the queue metrics, including the current ``depth`` of the queue and its ``max_depth``,
+        the number of ``running``, ``completed`` and ``failed`` tasks and the tasks ``rejected`` after the queue
+        is stopped, and the ``max_size`` and ``workers`` settings of the queue.
+        """
+        return {'depth': self._queue.qsize() if self._queue is not None else 0,
+                'max_depth': self._max_depth,
+                'running': self._running,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'max_size': self.max_size,
+                'workers': self.workers}
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        if self.is_started:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._worker_tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def put(self, coro: Coroutine) -> None:
+        """Add a task to the queue (and wait if the queue is full).
+
+        If the queue is stopped, the task is closed without being executed.
+
+        :param coro: The coroutine object of the task
+        """
+        if self._stopped:
+            self._rejected += 1
+            coro.close()
+            LOGGER.warning(f'Background task "{coro.__qualname__}" is rejected (the queue is stopped)')
+            return
+        if not self.is_started:
+            self.start()
+        await self._queue.put(coro)
+        depth = self._queue.qsize()
+        if depth > self._max_depth:
+            self._max_depth = depth
+
+    async def stop(self, timeout: Optional[float] = None) -> int:
+        """Wait until the queued tasks are done and stop the worker tasks.
+
+        :param timeout: Maximum time in seconds to wait for the queued tasks (or None to wait until they are done)
+        :return: Number of the tasks that were cut off
+        """
+        self._stopped = True
+        if not self.is_started:
+            return 0
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        cut_off = self._running
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = list()
+        while not self._queue.empty():
+            self._queue.get_nowait().close()
+            self._queue.task_done()
+            cut_off += 1
+        if cut_off:
+            LOGGER.warning(f'{cut_off} background tasks were cut off')
+        return cut_off
+
+    async def _worker(self) -> None:
+        while True:
+            coro = await self._queue.get()
+            self._running += 1
+            try:
+                await coro
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                LOGGER.exception(f'Background task error: {e}')
+            else:
+                self._completed += 1
+            finally:
+                self._running -= 1
+                self._queue.task_done()
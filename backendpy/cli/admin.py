@@ -1,11 +1,14 @@
 import argparse
 import asyncio
+import importlib
 import os
 import sys
 
+from backendpy.app import App
 from backendpy.config import get_config
 from backendpy.initializer import Init
 from backendpy.logging import get_logger
+from backendpy.router import Router
 
 try:
     from backendpy.db import create_database
@@ -32,6 +35,8 @@ def main():
 
     sub_parser.add_parser('create_db')
 
+    sub_parser.add_parser('routes')
+
     args = parser.parse_args()
 
     if args.command == 'create_db':
@@ -39,6 +44,11 @@ def main():
         sys.path.append(os.path.dirname(config["environment"]["project_path"]))
         create_database(app_config=config)
 
+    elif args.command == 'routes':
+        config = get_config(os.getcwd())
+        sys.path.append(os.path.dirname(config["environment"]["project_path"]))
+        print_routes(app_config=config)
+
     elif args.command == 'create_project':
         current_dir = os.getcwd()
         project_name = args.name
@@ -525,3 +535,38 @@ async def hello(request):
             exit()
         finally:
             LOGGER.info(f"Backendpy app created successfully!")
+
+
+def print_routes(app_config):
+    """Print the compiled route table of each method with the overlapping routes and fan-outs."""
+
+    router = Router()
+    for package_name in app_config['apps']['active']:
+        try:
+            app = getattr(importlib.import_module(f'{package_name}.main'), 'app')
+            if isinstance(app, App):
+                for routes in app.routes:
+                    router.extend(routes, hosts=app.hosts)
+            else:
+                LOGGER.error(f'app "{package_name}" instance error')
+        except (ImportError, AttributeError):
+            LOGGER.error(f'app "{package_name}" instance import error')
+
+    for host, host_router in (('*', router), *router.host_routers.items()):
+        print(f'[Host: {host}]')
+        for method, items in host_router.analyze().items():
+            if not items:
+                continue
+            print(method)
+            path_width = max(len(i['path']) for i in items)
+            for i in items:
+                handler_name = f"{i['handler'].__module__}.{i['handler'].__qualname__}"
+                print(f"    {i['path']:<{path_width}}  fan-out: {i['fan_out']:<3}  {handler_name}")
+                for overlap in i['overlaps']:
+                    if overlap['kind'] == 'duplicate':
+                        print(f"        ! duplicate of {overlap['path']} (only the last definition is used)")
+                    elif overlap['kind'] == 'ambiguous':
+                        print(f"        ! ambiguous with {overlap['path']} (the first defined pattern is matched)")
+                    else:
+                        print(f"        ~ overlaps {overlap['path']} (resolved by priority)")
+            print()
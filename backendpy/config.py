@@ -37,13 +37,24 @@ def get_config(project_path: str, error_logs: bool = False) -> dict[str, dict[st
     config.setdefault('database', {})
     config.setdefault('apps', {})
     config.setdefault('middlewares', {})
+    config.setdefault('background_tasks', {})
+    config.setdefault('scheduler', {})
+    config.setdefault('thread_pool', {})
+    config.setdefault('process_pool', {})
+    config.setdefault('admission', {})
 
     # Add default configs if does not exists
     if type(config['apps'].get('active')) is not tuple:
         config['apps']['active'] = ()
+    if type(config['apps'].get('lazy')) is str:
+        config['apps']['lazy'] = (config['apps']['lazy'],)
+    elif type(config['apps'].get('lazy')) is not tuple:
+        config['apps']['lazy'] = ()
     if type(config['middlewares'].get('active')) is not tuple:
         config['middlewares']['active'] = ()
-    if type(config['networking'].get('allowed_hosts')) is not tuple:
+    if type(config['networking'].get('allowed_hosts')) is str:
+        config['networking']['allowed_hosts'] = (config['networking']['allowed_hosts'],)
+    elif type(config['networking'].get('allowed_hosts')) is not tuple:
         config['networking']['allowed_hosts'] = ()
 
     # Set environment configs
@@ -52,7 +52,10 @@ class Data:
             elif field.type == TYPE_URL_VAR \
                     and request.url_vars is not None \
                     and k in request.url_vars:
-                data[name] = request.url_vars[k]
+                # The typed URL vars are converted by the router, but the fields receive them as strings
+                # like the other request data
+                value = request.url_vars[k]
+                data[name] = value if isinstance(value, str) else str(value)
             elif field.type == TYPE_FILE \
                     and request.body.files is not None \
                     and k in request.body.files:
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
-import asyncio
 import base64
-import concurrent.futures.thread
 import datetime
 import decimal
 from collections.abc import Iterable, Sequence
-from functools import partial
 from html import escape, unescape
 from io import BytesIO
 from typing import Any, Optional
 
+from ..processpool import get_process_pool
+
 try:
     from PIL import Image
 except ImportError:
@@ -149,9 +148,8 @@ class ModifyImage(Filter):
     async def __call__(self, value: bytes) -> bytes:
         if value in (None, '', b''):
             return value
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            return await asyncio.get_running_loop().run_in_executor(
-                pool, partial(self._modify, value))
+        # Image processing is CPU bound and is run in the project process pool
+        return await get_process_pool().run(self._modify, value)
 
     def _modify(self, value: bytes) -> bytes:
         # Todo: (read from / write to) buffer ?
@@ -3,7 +3,9 @@ from __future__ import annotations
 import asyncio
 import importlib
 from collections.abc import Mapping
+from typing import Optional
 
+from sqlalchemy import event
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +14,7 @@ from sqlalchemy.ext.asyncio import async_scoped_session
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import Session
 
 from .app import App
 from .logging import get_logger
@@ -32,7 +35,8 @@ def set_database_hooks(app):
             config=app.config['database'])
         app.context['db_session'] = get_db_session(
             engine=app.context['db_engine'],
-            scope_func=app.get_current_request)
+            scope_func=app.get_current_request,
+            remaining_time_func=lambda: app.get_current_request().remaining_time)
 
     @app.event('shutdown')
     async def on_shutdown():
@@ -61,10 +65,34 @@ def get_db_engine(config: Mapping) -> AsyncEngine:
         isolation_level=config.get('isolation_level', 'SERIALIZABLE'))
 
 
-def get_db_session(engine: AsyncEngine, scope_func: callable) -> async_scoped_session[AsyncSession]:
-    """Construct a new Sqlalchemy async scoped session."""
+def get_db_session(engine: AsyncEngine, scope_func: callable, remaining_time_func: Optional[callable] = None) \
+        -> async_scoped_session[AsyncSession]:
+    """
+    Construct a new Sqlalchemy async scoped session.
 
-    async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    If the ``remaining_time_func`` is set (a function that returns the remaining time budget of the current
+    request in seconds, or None), the statement timeout of each transaction is limited to this time.
+    """
+
+    if remaining_time_func is None:
+        async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    else:
+        class DeadlineSession(Session):
+            pass
+
+        @event.listens_for(DeadlineSession, 'after_begin')
+        def set_statement_timeout(session, transaction, connection):
+            try:
+                remaining_time = remaining_time_func()
+            except LookupError:
+                # Outside the requests (e.g. in background tasks)
+                return
+            if remaining_time is not None:
+                connection.exec_driver_sql(
+                    f'SET LOCAL statement_timeout = {max(int(remaining_time * 1000), 1)}')
+
+        async_session_factory = async_sessionmaker(
+            engine, expire_on_commit=False, sync_session_class=DeadlineSession)
     return async_scoped_session(async_session_factory, scopefunc=scope_func)
 
 
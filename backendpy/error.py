@@ -149,4 +149,8 @@ base_errors = ErrorList(
     ErrorCode(1000, "Server error", Status.INTERNAL_SERVER_ERROR),
     ErrorCode(1001, "Not found", Status.NOT_FOUND),
     ErrorCode(1002, "Unexpected data", Status.BAD_REQUEST),
-    ErrorCode(1003, "Disallowed host", Status.BAD_REQUEST),)
+    ErrorCode(1003, "Disallowed host", Status.BAD_REQUEST),
+    ErrorCode(1004, "Method not allowed", Status.METHOD_NOT_ALLOWED),
+    ErrorCode(1005, "Request timeout", Status.GATEWAY_TIME_OUT),
+    ErrorCode(1006, "Service unavailable", Status.SERVICE_UNAVAILABLE),
+    ErrorCode(1007, "Too many requests", Status.TOO_MANY_REQUESTS),)
@@ -1,26 +1,62 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from collections.abc import Mapping, Iterable
-from inspect import iscoroutinefunction
 from typing import Optional, Any
 
+from .logging import get_logger
+from .threadpool import to_async
+
+LOGGER = get_logger(__name__)
+
 
 class Hooks:
     """Hook registry class"""
 
     def __init__(self) -> None:
         self._items: dict[str, list[callable]] = dict()
+        self._concurrent_hooks: dict[str, dict[callable, Optional[float]]] = dict()
+        self._concurrent_events: dict[str, Optional[float]] = dict()
 
     @property
     def items(self) -> dict[str, list[callable]]:
         """Get registered event hooks."""
         return self._items
 
-    def register(self, event_name: str, func: callable) -> None:
-        """Register an event hook."""
-        if not iscoroutinefunction(func):
-            raise TypeError('The "func" parameter must be an asynchronous function.')
+    @property
+    def concurrent_hooks(self) -> dict[str, dict[callable, Optional[float]]]:
+        """Get the hooks registered as concurrent and their timeouts."""
+        return self._concurrent_hooks
+
+    @property
+    def concurrent_events(self) -> dict[str, Optional[float]]:
+        """Get the events declared as concurrent and their hooks timeout."""
+        return self._concurrent_events
+
+    def register(self, event_name: str, func: callable, concurrent: bool = False,
+                 timeout: Optional[float] = None) -> None:
+        """Register an event hook.
+
+        :param event_name: The name of an event
+        :param func: The hook function (synchronous functions are executed in the project thread pool)
+        :param concurrent: Whether the hook is executed concurrently with the other concurrent hooks of the event
+        :param timeout: Timeout of the concurrent hook in seconds (or None)
+        """
+        if not callable(func):
+            raise TypeError('The "func" parameter must be a function.')
+        func = to_async(func)
         self._register(event_name, func)
+        if concurrent:
+            self._concurrent_hooks.setdefault(event_name, dict())[func] = timeout
+
+    def concurrent_event(self, name: str, timeout: Optional[float] = None) -> None:
+        """Declare an event as concurrent, so that all its hooks are executed concurrently.
+
+        :param name: The name of an event
+        :param timeout: Timeout of each hook in seconds (or None)
+        """
+        self._concurrent_events[name] = timeout
 
     def register_batch(self, items: Mapping[str, Iterable[callable]]) -> None:
         """Register multiple event hooks at once."""
@@ -28,13 +64,15 @@ class Hooks:
             for func in funcs:
                 self.register(event_name, func)
 
-    def event(self, name: str) -> callable:
+    def event(self, name: str, concurrent: bool = False, timeout: Optional[float] = None) -> callable:
         """Register an event hook with python decorator.
 
         :param name: The name of an event
+        :param concurrent: Whether the hook is executed concurrently with the other concurrent hooks of the event
+        :param timeout: Timeout of the concurrent hook in seconds (or None)
         """
         def decorator_register(func: callable) -> None:
-            self.register(name, func)
+            self.register(name, func, concurrent, timeout)
         return decorator_register
 
     def merge(self, other: Hooks) -> None:
@@ -44,6 +82,9 @@ class Hooks:
         for event_name, funcs in other.items.items():
             for func in funcs:
                 self._register(event_name, func)
+        for event_name, funcs in other.concurrent_hooks.items():
+            self._concurrent_hooks.setdefault(event_name, dict()).update(funcs)
+        self._concurrent_events.update(other.concurrent_events)
 
     def _register(self, event_name: str, func: callable) -> None:
         if event_name not in self._items:
@@ -61,8 +102,8 @@ class Hooks:
         if not isinstance(other, self.__class__):
             raise TypeError(f"{type(self.__class__)} and {type(other)} cannot be concatenated.")
         new = self.__class__()
-        new.register_batch(self._items)
-        new.register_batch(other.items)
+        new.merge(self)
+        new.merge(other)
         return new
 
 
@@ -71,16 +112,104 @@ class HookRunner:
 
     def __init__(self) -> None:
         self.hooks = Hooks()
+        self._events: Optional[dict[str, tuple[tuple[callable, ...],
+                                               tuple[tuple[callable, Optional[float], str], ...]]]] = None
+        self._stats: dict[tuple[str, str], dict[str, Any]] = dict()
+
+    def compile(self) -> None:
+        """Build the call lists of the events (must be called again after the hooks are changed)."""
+        self._events = dict()
+        for name, funcs in self.hooks.items.items():
+            if not funcs:
+                continue
+            if name in self.hooks.concurrent_events:
+                timeout = self.hooks.concurrent_events[name]
+                self._events[name] = (), tuple((func, timeout, self._get_hook_name(func)) for func in funcs)
+            else:
+                concurrent_hooks = self.hooks.concurrent_hooks.get(name, {})
+                self._events[name] = (
+                    tuple(func for func in funcs if func not in concurrent_hooks),
+                    tuple((func, concurrent_hooks[func], self._get_hook_name(func))
+                          for func in funcs if func in concurrent_hooks))
+
+    @staticmethod
+    def _get_hook_name(func: callable) -> str:
+        """Return the name of a hook in the stats (the hook can also be a callable instance)."""
+        return f'{getattr(func, "__module__", None) or type(func).__module__}.' \
+               f'{getattr(func, "__qualname__", None) or type(func).__qualname__}'
+
+    def has_hooks(self, name: str) -> bool:
+        """Whether any hook is registered for the event."""
+        if self._events is None:
+            self.compile()
+        return name in self._events
+
+    @property
+    def stats(self) -> dict[tuple[str, str], dict[str, Any]]:
+        """
+        Get the execution statistics of the concurrent hooks, keyed by (event name, hook name).
+        Each item contains the ``calls``, ``errors`` and ``timeouts`` counts and the ``total_time``
+        and ``max_time`` of the executions in seconds.
+        """
+        return self._stats
 
-    async def trigger(self, name: str, args: Optional[Mapping[str, Any]] = None) -> None:
+    async def trigger(self, name: str, args: Optional[Mapping[str, Any]] = None,
+                      hooks: Optional[Iterable[Hooks]] = None) -> None:
         """Trigger all hooks related to the event.
 
+        The sequential hooks of the event are executed in order and their errors are raised.
+        Then the concurrent hooks are executed together, and their errors and timeouts are
+        logged without affecting the other hooks.
+
         :param name: The name of an event
         :param args: A dictionary-like object containing arguments passed to the hook function.
+        :param hooks: If set, only the hooks of these registries (which are merged into the runner hooks),
+                      such as the hooks of a lazily loaded app, are executed
         """
-        if name in self.hooks:
-            for func in self.hooks[name]:
-                if args is not None:
-                    await func(**args)
-                else:
-                    await func()
+        if self._events is None:
+            self.compile()
+        event = self._events.get(name)
+        if event is None:
+            return
+        funcs, concurrent_funcs = event
+        if hooks is not None:
+            selected = {func for i in hooks if name in i for func in i[name]}
+            funcs = tuple(func for func in funcs if func in selected)
+            concurrent_funcs = tuple(item for item in concurrent_funcs if item[0] in selected)
+        if args is not None:
+            for func in funcs:
+                await func(**args)
+        else:
+            for func in funcs:
+                await func()
+        if concurrent_funcs:
+            if len(concurrent_funcs) == 1:
+                await self._run_concurrent_hook(name, *concurrent_funcs[0], args)
+            else:
+                await asyncio.gather(*(self._run_concurrent_hook(name, func, timeout, hook_name, args)
+                                       for func, timeout, hook_name in concurrent_funcs))
+
+    async def _run_concurrent_hook(self, name, func, timeout, hook_name, args):
+        key = (name, hook_name)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = {'calls': 0, 'errors': 0, 'timeouts': 0, 'total_time': 0.0, 'max_time': 0.0}
+        start_time = time.perf_counter()
+        try:
+            coro = func(**args) if args is not None else func()
+            if timeout is not None:
+                await asyncio.wait_for(coro, timeout)
+            else:
+                await coro
+        except asyncio.TimeoutError:
+            stats['timeouts'] += 1
+            LOGGER.error(f'"{key[1]}" hook of the "{name}" event timed out after {timeout} seconds')
+        except Exception as e:
+            stats['errors'] += 1
+            LOGGER.exception(f'"{key[1]}" hook of the "{name}" event error: {e}')
+        finally:
+            duration = time.perf_counter() - start_time
+            stats['calls'] += 1
+            stats['total_time'] += duration
+            if duration > stats['max_time']:
+                stats['max_time'] = duration
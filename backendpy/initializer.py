@@ -1,7 +1,6 @@
 import importlib
 import os
 import sys
-from inspect import iscoroutinefunction
 
 from .app import App
 from .config import get_config
@@ -22,11 +21,7 @@ class Init:
                     app = getattr(importlib.import_module(f'{package_name}.main'), 'app')
                     if isinstance(app, App):
                         if app.init_func:
-                            if iscoroutinefunction(app.init_func):
-                                await app.init_func(self.config)
-                            else:
-                                LOGGER.error(f'"{package_name}" Initialization error: '
-                                             f'The "init_func" must be a coroutine function')
+                            await app.init_func(self.config)
                     else:
                         LOGGER.error(f'"{package_name}" Initialization error: '
                                      f'App instance error')
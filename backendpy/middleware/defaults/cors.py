@@ -1,99 +1,132 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Optional
+
 from ..middleware import Middleware
 from ...response import Status, Response
 
+ALL_METHODS = ('GET', 'POST', 'PATCH', 'PUT', 'DELETE', 'OPTIONS', 'HEAD')
+CREDENTIALS_HEADERS = frozenset(('authorization', 'proxy-authorization', 'cookie', 'client-cert', 'client-cert-chain'))
+
+
+class CORSPolicy:
+    """The CORS config of a project compiled into sets and prebuilt response headers."""
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        """
+        Compile the CORS policy.
+
+        :param config: The ``cors`` section of the project config
+        """
+        allowed_origins = config.get('allowed_origins')
+        self.all_origins = allowed_origins == '*'
+        self.origins: frozenset[str] = frozenset() if not allowed_origins or self.all_origins else \
+            frozenset(o.lower() for o in ((allowed_origins,) if type(allowed_origins) is str else allowed_origins))
+
+        allowed_methods = config.get('allowed_methods')
+        if not allowed_methods:
+            methods = ()
+        elif allowed_methods == '*':
+            methods = ALL_METHODS
+        elif type(allowed_methods) is str:
+            methods = (allowed_methods.upper(),)
+        else:
+            methods = tuple(map(str.upper, allowed_methods))
+        self.methods: frozenset[str] = frozenset(methods)
+        self.methods_header: Optional[tuple[bytes, bytes]] = \
+            (b'access-control-allow-methods', ', '.join(methods).encode()) if methods else None
+
+        allowed_headers = config.get('allowed_headers')
+        self.all_headers = allowed_headers == '*'
+        self.headers: Optional[frozenset[str]] = None if not allowed_headers else frozenset() if self.all_headers else \
+            frozenset(h.lower() for h in ((allowed_headers,) if type(allowed_headers) is str else allowed_headers))
+
+        self.allow_credentials = config.get('allow_credentials') == 'true'
+        self.max_age_header = (b'access-control-max-age', config.get('max-age', '86400').encode())
+        self.preflight_cache_size = int(config.get('preflight_cache_size', 1024))
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        return self.all_origins or origin.lower() in self.origins
+
+    def get_preflight_headers(self, origin: Optional[str], method: Optional[str], headers: Optional[str]) \
+            -> tuple[tuple[bytes, bytes], ...]:
+        """Return the response headers of a preflight request."""
+        response_headers = list()
+        if origin and self.is_allowed_origin(origin):
+            response_headers.append((b'access-control-allow-origin', origin.encode()))
+            if method and self.methods_header is not None and method.upper() in self.methods:
+                response_headers.append(self.methods_header)
+            if headers is not None and self.headers is not None:
+                requested_headers = headers.replace(' ', '').lower().split(',')
+                allowed_requested_headers = requested_headers if self.all_headers else \
+                    [h for h in requested_headers if h in self.headers]
+                response_headers.append(
+                    (b'access-control-allow-headers', ', '.join(allowed_requested_headers).encode()))
+                if self.allow_credentials and not CREDENTIALS_HEADERS.isdisjoint(allowed_requested_headers):
+                    response_headers.append((b'access-control-allow-credentials', b'true'))
+            response_headers.append(self.max_age_header)
+        response_headers.append((b'vary', b'origin'))
+        return tuple(response_headers)
+
 
 class CORSMiddleware(Middleware):
 
-    @staticmethod
-    async def process_request(request):
+    def __init__(self) -> None:
+        self._policy: Optional[CORSPolicy] = None
+        self._preflight_cache: OrderedDict[tuple, tuple[tuple[bytes, bytes], ...]] = OrderedDict()
+
+    def _get_policy(self, request) -> CORSPolicy:
+        if self._policy is None:
+            self._policy = CORSPolicy(request.app.config.get('cors', {}))
+        return self._policy
+
+    async def process_request(self, request):
         if request.method == 'OPTIONS':
-            config = request.app.config.get('cors', {})
-            response_headers = dict()
-
-            if 'origin' in request.headers:
-                requested_origin = request.headers.get('origin')
-                if requested_origin:
-                    allowed_origins = config.get('allowed_origins')
-                    if allowed_origins:
-                        if allowed_origins != '*' and type(allowed_origins) is str:
-                            allowed_origins = [allowed_origins]
-                        if allowed_origins == '*' or requested_origin.lower() in allowed_origins:
-                            response_headers['access-control-allow-origin'] = requested_origin
-
-                            requested_method = request.headers.get('access-control-request-method')
-                            if requested_method:
-                                allowed_methods = config.get('allowed_methods')
-                                if allowed_methods:
-                                    if allowed_methods == '*':
-                                        allowed_methods = ['GET', 'POST', 'PATCH', 'PUT', 'DELETE', 'OPTIONS', 'HEAD']
-                                    elif type(allowed_methods) is str:
-                                        allowed_methods = [allowed_methods.upper()]
-                                    else:
-                                        allowed_methods = list(map(str.upper, allowed_methods))
-                                    if requested_method.upper() in allowed_methods:
-                                        response_headers['access-control-allow-methods'] = ', '.join(allowed_methods)
-
-                            requested_headers = \
-                                list(map(str.lower, request.headers.get('access-control-request-headers')
-                                         .replace(' ', '').split(',')))
-                            if requested_headers:
-                                allowed_headers = config.get('allowed_headers')
-                                if allowed_headers:
-                                    if allowed_headers != '*':
-                                        if type(allowed_headers) is str:
-                                            allowed_headers = [allowed_headers.lower()]
-                                        else:
-                                            allowed_headers = list(map(str.lower, allowed_headers))
-                                    allowed_requested_headers = requested_headers if allowed_headers == '*' else \
-                                        (h for h in requested_headers if h in allowed_headers)
-                                    response_headers['access-control-allow-headers'] = \
-                                        ', '.join(allowed_requested_headers)
-
-                                    if config.get('allow_credentials') == 'true' \
-                                            and ('authorization' in allowed_requested_headers
-                                                 or 'proxy-authorization' in allowed_requested_headers
-                                                 or 'cookie' in allowed_requested_headers
-                                                 or 'client-cert' in allowed_requested_headers
-                                                 or 'client-cert-chain' in allowed_requested_headers):
-                                        response_headers['access-control-allow-credentials'] = 'true'
-
-                            if response_headers:
-                                response_headers['access-control-max-age'] = config.get('max-age', '86400')
-
-            response_headers['vary'] = 'origin'
+            policy = self._get_policy(request)
+            key = (request.headers.get('origin'),
+                   request.headers.get('access-control-request-method'),
+                   request.headers.get('access-control-request-headers'))
+            response_headers = self._preflight_cache.get(key)
+            if response_headers is None:
+                response_headers = policy.get_preflight_headers(*key)
+                if policy.preflight_cache_size > 0:
+                    self._preflight_cache[key] = response_headers
+                    if len(self._preflight_cache) > policy.preflight_cache_size:
+                        self._preflight_cache.popitem(last=False)
+            else:
+                self._preflight_cache.move_to_end(key)
 
             response = Response(
                 status=Status.NO_CONTENT,
                 body=b'',
-                headers=list(response_headers.items()))
+                headers=list(response_headers))
 
             return request, response
         else:
             return request, None
 
-    @staticmethod
-    async def process_response(request, response):
+    async def process_response(self, request, response):
         if request.method != 'OPTIONS':
-            response_headers = dict(response.headers) if response.headers is not None else dict()
-            if 'origin' in request.headers:
-                requested_origin = request.headers.get('origin')
-                if requested_origin:
-                    config = request.app.config.get('cors', {})
-                    allowed_origins = config.get('allowed_origins')
-                    if allowed_origins:
-                        if allowed_origins != '*' and type(allowed_origins) is str:
-                            allowed_origins = [allowed_origins]
-                        if allowed_origins == '*' or requested_origin.lower() in allowed_origins:
-                            response_headers['access-control-allow-origin'] = requested_origin
-                            if config.get('allow_credentials') == 'true' \
-                                and ('authorization' in request.headers
-                                     or 'proxy-authorization' in request.headers
-                                     or 'cookie' in request.headers
-                                     or 'client-cert' in request.headers
-                                     or 'client-cert-chain' in request.headers):
-                                response_headers['access-control-allow-credentials'] = 'true'
-            vary = response_headers.get('vary')
-            response_headers['vary'] = ', '.join(set(vary.replace(' ', '').split(',') + ['origin'])) \
-                if vary else 'origin'
-            response.headers = list(response_headers.items())
+            if response.headers is None:
+                response.headers = []
+            elif type(response.headers) is not list:
+                response.headers = list(response.headers)
+            response_headers = response.headers
+            requested_origin = request.headers.get('origin')
+            if requested_origin:
+                policy = self._get_policy(request)
+                if policy.is_allowed_origin(requested_origin):
+                    response_headers.append((b'access-control-allow-origin', requested_origin.encode()))
+                    if policy.allow_credentials and not CREDENTIALS_HEADERS.isdisjoint(request.headers):
+                        response_headers.append((b'access-control-allow-credentials', b'true'))
+            for i, (name, value) in enumerate(response_headers):
+                if (name if type(name) is bytes else name.encode()).lower() == b'vary':
+                    vary = value if type(value) is bytes else value.encode()
+                    if b'origin' not in vary.lower().replace(b' ', b'').split(b','):
+                        response_headers[i] = (b'vary', vary + b', origin')
+                    break
+            else:
+                response_headers.append((b'vary', b'origin'))
         return response
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from ..middleware import Middleware
+from ...error import Error
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def client_ip_key(request) -> Optional[str]:
+    """Return the rate limit key of the client IP address of a request."""
+    return request.client['ip'] if request.client else None
+
+
+def path_key(request) -> Optional[str]:
+    """Return the rate limit key of the client IP address and the method and path of a request."""
+    return f'{client_ip_key(request)} {request.method} {request.path}'
+
+
+def user_key(request, context_key: str = 'user_id') -> Optional[str]:
+    """Return the rate limit key of the user ID of a request (set in the request context by an auth middleware),
+    or the client IP address for the anonymous requests."""
+    user_id = request.context.get(context_key)
+    return f'user:{user_id}' if user_id is not None else client_ip_key(request)
+
+
+KEY_FUNCTIONS = {'ip': client_ip_key, 'path': path_key, 'user': user_key}
+
+
+class TokenBucketStore:
+    """
+    The token buckets of the rate limit keys in an in-memory structure.
+
+    The buckets are distributed between shards, each of which is a bounded LRU structure, and the buckets
+    that have not been used for longer than their refill time (which are full again) are evicted.
+    """
+
+    def __init__(self, rate: float, burst: int, max_size: int = 100000, shards: int = 16) -> None:
+        """
+        Initialize the store.
+
+        :param rate: Number of the tokens added to each bucket per second
+        :param burst: Capacity of each bucket
+        :param max_size: Maximum number of the buckets kept in the store
+        :param shards: Number of the shards
+        """
+        self.rate = rate
+        self.burst = burst
+        self.ttl = burst / rate
+        self._shards: tuple[OrderedDict[str, list[float]], ...] = tuple(OrderedDict() for _ in range(shards))
+        self._shard_size = max(1, max_size // shards)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._shards))
+
+    def consume(self, key: str) -> float:
+        """
+        Take a token from the bucket of a key.
+
+        :param key: The rate limit key
+        :return: Zero if a token is taken, otherwise the time in seconds until a token is available
+        """
+        now = time.monotonic()
+        shard = self._shards[hash(key) % len(self._shards)]
+        bucket = shard.get(key)
+        if bucket is None:
+            # Evict the expired buckets (the shard is ordered by the last use of the buckets)
+            while shard:
+                oldest = next(iter(shard.values()))
+                if now - oldest[1] < self.ttl and len(shard) < self._shard_size:
+                    break
+                shard.popitem(last=False)
+            bucket = shard[key] = [float(self.burst), now]
+        else:
+            shard.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0
+        return (1 - bucket[0]) / self.rate
+
+
+class SharedTokenBucketStore:
+    """
+    The token buckets of the rate limit keys in a fixed-size hash table in a memory-mapped file (on the
+    ``/dev/shm`` shared memory file system if it exists), which is shared between all the worker processes
+    of the host. Each shard of the table is guarded by a lock on its region of the file.
+
+    If the table slots of a key are all occupied, the least recently used bucket is replaced.
+    """
+
+    _SLOT = struct.Struct('<Qdd')
+    _PROBES = 8
+
+    def __init__(self, rate: float, burst: int, path: str, max_size: int = 100000, shards: int = 16) -> None:
+        """
+        Initialize the store.
+
+        :param rate: Number of the tokens added to each bucket per second
+        :param burst: Capacity of each bucket
+        :param path: Path of the shared file (the processes that use the same path share the limits)
+        :param max_size: Number of the table slots
+        :param shards: Number of the shards
+        """
+        if fcntl is None:
+            raise RuntimeError('The shared rate limit store is not supported on this platform')
+        self.rate = rate
+        self.burst = burst
+        self.ttl = burst / rate
+        self.path = path
+        self._shards = shards
+        self._shard_size = max(self._PROBES, max_size // shards)
+        size = self._SLOT.size * self._shard_size * shards
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    def consume(self, key: str) -> float:
+        """
+        Take a token from the bucket of a key.
+
+        :param key: The rate limit key
+        :return: Zero if a token is taken, otherwise the time in seconds until a token is available
+        """
+        key_hash = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') | 1
+        shard = key_hash % self._shards
+        shard_offset = shard * self._shard_size * self._SLOT.size
+        shard_length = self._shard_size * self._SLOT.size
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, shard_length, shard_offset)
+        try:
+            now = time.time()
+            slot = tokens = last = None
+            oldest_slot, oldest_last = None, math.inf
+            start = (key_hash // self._shards) % self._shard_size
+            for i in range(self._PROBES):
+                offset = shard_offset + ((start + i) % self._shard_size) * self._SLOT.size
+                slot_hash, slot_tokens, slot_last = self._SLOT.unpack_from(self._map, offset)
+                if slot_hash == key_hash:
+                    slot, tokens, last = offset, slot_tokens, slot_last
+                    break
+                if slot_hash == 0 or now - slot_last >= self.ttl:
+                    # An empty or expired slot
+                    slot_last = -math.inf
+                if slot_last < oldest_last:
+                    oldest_slot, oldest_last = offset, slot_last
+            if slot is None:
+                slot, tokens = oldest_slot, float(self.burst)
+            else:
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+            delay = 0 if tokens >= 1 else (1 - tokens) / self.rate
+            self._SLOT.pack_into(self._map, slot, key_hash, tokens - 1 if tokens >= 1 else tokens, now)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, shard_length, shard_offset)
+        return delay
+
+
+def get_default_store_path(project_path: str) -> str:
+    """Return the default path of the shared rate limit store of a project."""
+    name = hashlib.sha1(os.path.abspath(project_path).encode()).hexdigest()[:16]
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(directory, f'backendpy-ratelimit-{name}.bin')
+
+
+class RateLimitMiddleware(Middleware):
+    """
+    A request middleware that limits the rate of the requests of each key (such as the client IP address
+    or the user) with the token bucket algorithm, and rejects the requests that exceed the limit with the
+    ``1007`` (Too many requests) error response.
+
+    The settings that are not passed to the middleware are read from the ``rate_limit`` section of the project
+    config, so the middleware can be activated in the config or attached to the routes with different settings.
+    """
+
+    def __init__(
+            self,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+            key_func: Optional[callable] = None,
+            shared: Optional[bool] = None,
+            name: Optional[str] = None) -> None:
+        """
+        Initialize the middleware.
+
+        :param rate: Number of the allowed requests of each key per second
+        :param burst: Maximum number of the requests of each key in a burst
+        :param key_func: A function that takes the request and returns its rate limit key (or None to not limit
+                         the request), such as :func:`client_ip_key`, :func:`user_key` or :func:`path_key`
+        :param shared: Whether the limits are shared between the worker processes of the host
+        :param name: Name of the limits in the shared store, which is the place where the middleware is created
+                     by default (so the limits of the middlewares created in different places, such as the routes
+                     with the same settings, are kept separately, like the in-memory limits of each middleware)
+        """
+        self._rate = rate
+        self._burst = burst
+        self._key_func = key_func
+        self._shared = shared
+        if name is None:
+            # The place where the middleware is created is the same in all the worker processes
+            frame = inspect.currentframe().f_back
+            name = f'{frame.f_code.co_filename}:{frame.f_lineno}'
+        self._name = name
+        self._store: Optional[TokenBucketStore | SharedTokenBucketStore] = None
+        self._limit_headers: tuple[tuple[bytes, bytes], ...] = ()
+        self._retry_after_headers: dict[int, tuple[bytes, bytes]] = dict()
+
+    def _setup(self, request) -> None:
+        config: Mapping[str, Any] = request.app.config.get('rate_limit', {})
+        rate = self._rate if self._rate is not None else float(config.get('rate', 10))
+        burst = self._burst if self._burst is not None else int(config.get('burst', max(1, math.ceil(rate))))
+        if self._key_func is None:
+            key = config.get('key', 'ip')
+            if key not in KEY_FUNCTIONS:
+                raise ValueError(f'Invalid rate limit key "{key}"')
+            self._key_func = KEY_FUNCTIONS[key]
+            if key == 'user' and config.get('user_context_key'):
+                context_key = config['user_context_key']
+                self._key_func = lambda r: user_key(r, context_key)
+        shared = self._shared if self._shared is not None else config.get('shared') == 'true'
+        max_size = int(config.get('max_size', 100000))
+        shards = int(config.get('shards', 16))
+        if shared:
+            path = config.get('shared_path') or \
+                get_default_store_path(request.app.config['environment']['project_path'])
+            path += f'.{hashlib.sha1(self._name.encode()).hexdigest()[:16]}'
+            self._store = SharedTokenBucketStore(rate, burst, path, max_size, shards)
+        else:
+            self._store = TokenBucketStore(rate, burst, max_size, shards)
+        self._limit_headers = ((b'ratelimit-limit', str(burst).encode()),
+                               (b'ratelimit-policy', f'{burst};w={math.ceil(burst / rate)}'.encode()))
+
+    async def process_request(self, request):
+        if self._store is None:
+            self._setup(request)
+        key = self._key_func(request)
+        if key is None:
+            return request, None
+        delay = self._store.consume(key)
+        if not delay:
+            return request, None
+        retry_after = math.ceil(delay)
+        header = self._retry_after_headers.get(retry_after)
+        if header is None:
+            header = self._retry_after_headers[retry_after] = (b'retry-after', str(retry_after).encode())
+        return request, Error(1007, headers=[header, *self._limit_headers])
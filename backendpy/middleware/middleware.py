@@ -54,27 +54,57 @@ class Middleware:
 
 class MiddlewareProcessor:
 
-    def __init__(self, paths=None):
+    def __init__(self, paths=None, middlewares=None):
         self._middlewares_paths = paths if paths else []
-        self._middlewares = []
+        self._middlewares = list(middlewares) if middlewares else []
+        self.request_processors = None
+        self.handler_processors = None
+        self.response_processors = None
 
     @property
     def middlewares(self):
         if not self._middlewares:
             for m in self._middlewares_paths:
-                module_name, class_name = m.rsplit('.', 1)
-                self._middlewares.append(getattr(importlib.import_module(module_name), class_name)())
+                self._middlewares.append(self.load_middleware(m))
         return self._middlewares
 
+    @staticmethod
+    def load_middleware(middleware):
+        """Return the middleware instance of a middleware class, instance or dotted path."""
+        if isinstance(middleware, str):
+            module_name, class_name = middleware.rsplit('.', 1)
+            middleware = getattr(importlib.import_module(module_name), class_name)
+        return middleware() if isinstance(middleware, type) else middleware
+
+    def compile(self):
+        """
+        Build the call lists of the request, handler and response phases, which only contain the
+        methods that are overridden by the middlewares (the base methods of the
+        :class:`~backendpy.middleware.middleware.Middleware` class do nothing and are skipped).
+        """
+        self.request_processors = tuple(
+            m.process_request for m in self.middlewares if self._is_overridden(m, 'process_request'))
+        self.handler_processors = tuple(
+            m.process_handler for m in self.middlewares if self._is_overridden(m, 'process_handler'))
+        self.response_processors = tuple(
+            m.process_response for m in reversed(self.middlewares) if self._is_overridden(m, 'process_response'))
+
+    @staticmethod
+    def _is_overridden(middleware, method_name):
+        method = getattr(type(middleware), method_name, None)
+        return method is not None and method is not getattr(Middleware, method_name)
+
     def run_process_application(self, application):
         for middleware in self.middlewares:
             application = middleware.process_application(application)
         return application
 
     async def run_process_request(self, request):
-        for middleware in self.middlewares:
+        if self.request_processors is None:
+            self.compile()
+        for process_request in self.request_processors:
             try:
-                request, direct_response = await middleware.process_request(request)
+                request, direct_response = await process_request(request)
                 if direct_response:
                     return request, direct_response
             except ExceptionResponse as e:
@@ -82,11 +112,15 @@ class MiddlewareProcessor:
         return request, None
 
     async def run_process_handler(self, request, handler):
-        for middleware in self.middlewares:
-            handler = await middleware.process_handler(request, handler)
+        if self.handler_processors is None:
+            self.compile()
+        for process_handler in self.handler_processors:
+            handler = await process_handler(request, handler)
         return handler
 
     async def run_process_response(self, request, response):
-        for middleware in reversed(self.middlewares):
-            response = await middleware.process_response(request, response)
+        if self.response_processors is None:
+            self.compile()
+        for process_response in self.response_processors:
+            response = await process_response(request, response)
         return response
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Any
+
+from .logging import get_logger
+
+LOGGER = get_logger(__name__)
+
+
+class SharedBytes:
+    """A reference to bytes data that is transferred between processes through a shared memory block."""
+
+    __slots__ = ('name', 'size')
+
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+
+    @classmethod
+    def create(cls, data: bytes) -> SharedBytes:
+        """Copy the data to a new shared memory block."""
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        try:
+            shm.buf[:len(data)] = data
+        finally:
+            shm.close()
+        return cls(shm.name, len(data))
+
+    def read(self, unlink: bool = False) -> bytes:
+        """Read the data from the shared memory block (and optionally release the block)."""
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            return bytes(shm.buf[:self.size])
+        finally:
+            shm.close()
+            if unlink:
+                shm.unlink()
+
+    def unlink(self) -> None:
+        """Release the shared memory block."""
+        shm = shared_memory.SharedMemory(name=self.name)
+        shm.close()
+        shm.unlink()
+
+
+def _call(func, args, kwargs, shared_memory_threshold):
+    """Run a function in a worker process (with the shared memory data resolved)."""
+    args = tuple(a.read() if type(a) is SharedBytes else a for a in args)
+    kwargs = {k: v.read() if type(v) is SharedBytes else v for k, v in kwargs.items()}
+    result = func(*args, **kwargs)
+    if shared_memory_threshold and type(result) is bytes and len(result) >= shared_memory_threshold:
+        return SharedBytes.create(result)
+    return result
+
+
+class ProcessPool:
+    """
+    A pool of worker processes for running the CPU bound functions outside the event loop process.
+
+    The functions and their arguments must be picklable. The bytes arguments and results that are larger
+    than the shared memory threshold are transferred through shared memory blocks instead of being pickled.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            max_tasks_per_child: Optional[int] = None,
+            shared_memory_threshold: int = 1024 * 1024) -> None:
+        """
+        Initialize the process pool.
+
+        :param max_workers: Number of the worker processes (the default is the number of CPUs)
+        :param max_tasks_per_child: Maximum number of the tasks a worker process runs before it is replaced
+                                    with a new process (requires Python 3.11+)
+        :param shared_memory_threshold: Minimum size of the bytes arguments and results that are transferred
+                                        through shared memory (0 to disable)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_tasks_per_child = max_tasks_per_child
+        self.shared_memory_threshold = shared_memory_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+
+    @property
+    def is_started(self) -> bool:
+        return self._executor is not None
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Get the process pool metrics (the number of ``running``, ``completed`` and ``failed`` tasks)."""
+        return {'running': self._running,
+                'completed': self._completed,
+                'failed': self._failed,
+                'max_workers': self.max_workers}
+
+    def start(self) -> None:
+        """Start the pool (the worker processes are started on demand)."""
+        if self._executor is not None:
+            return
+        options = dict()
+        if self.max_tasks_per_child:
+            if sys.version_info >= (3, 11):
+                options['max_tasks_per_child'] = self.max_tasks_per_child
+            else:
+                LOGGER.warning('The "max_tasks_per_child" option of the process pool requires Python 3.11+')
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, **options)
+
+    def stop(self) -> None:
+        """Stop the worker processes (the queued tasks are cancelled)."""
+        if self._executor is not None:
+            if sys.version_info >= (3, 9):
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def run(self, func: callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a function in a worker process and return its result."""
+        if self._executor is None:
+            self.start()
+        shared = list()
+        if self.shared_memory_threshold:
+            args = tuple(self._share(a, shared) for a in args)
+            kwargs = {k: self._share(v, shared) for k, v in kwargs.items()}
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(_call, func, args, kwargs, self.shared_memory_threshold)
+        waiter = asyncio.wrap_future(future, loop=loop)
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(self._release, f, waiter, shared))
+        self._running += 1
+        try:
+            result = await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None \
+                    and type(waiter.result()) is SharedBytes:
+                # The result is received but the caller is cancelled before reading it
+                waiter.result().unlink()
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        else:
+            self._completed += 1
+        finally:
+            self._running -= 1
+        if type(result) is SharedBytes:
+            result = result.read(unlink=True)
+        return result
+
+    @staticmethod
+    def _release(future, waiter, shared):
+        """Release the shared memory blocks of the arguments of a finished call (and of its result if the caller
+        is cancelled before the result is received)."""
+        for i in shared:
+            i.unlink()
+        if waiter.cancelled() and not future.cancelled() and future.exception() is None \
+                and type(future.result()) is SharedBytes:
+            future.result().unlink()
+
+    def _share(self, value, shared):
+        if type(value) is bytes and len(value) >= self.shared_memory_threshold:
+            value = SharedBytes.create(value)
+            shared.append(value)
+        return value
+
+
+_default_process_pool: Optional[ProcessPool] = None
+
+
+def get_process_pool() -> ProcessPool:
+    """Return the default process pool (which is set by the project)."""
+    global _default_process_pool
+    if _default_process_pool is None:
+        _default_process_pool = ProcessPool()
+    return _default_process_pool
+
+
+def set_process_pool(process_pool: ProcessPool) -> None:
+    """Set the default process pool."""
+    global _default_process_pool
+    _default_process_pool = process_pool
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, AsyncIterable, Callable, Awaitable
+import asyncio
+import time
+from collections.abc import Mapping, AsyncIterable, Callable, Awaitable, Coroutine, Iterable, Iterator, \
+    KeysView, ValuesView, ItemsView
 from email import parser
 from typing import TYPE_CHECKING, Optional, Any, Type
 from urllib.parse import parse_qs
@@ -21,6 +24,9 @@ class Request:
     Base HTTP request class whose instances are used to store the information of a request
     and then these instances are sent to the requests handlers.
 
+    The headers, query string parameters, cookies and the server and client information are parsed from
+    the ASGI scope on their first access, so the request only pays for the information that is used.
+
     :ivar app: :class:`~backendpy.Backendpy` class instance of the current project (that is an ASGI application).
                The information that is defined in the general scope of the project can be accessed through the
                app field of each request. For example ``request.app.config`` contains project config information.
@@ -40,18 +46,27 @@ class Request:
     :ivar scheme: URL scheme of HTTP request
     :ivar server: A dictionary of server information (including host and port)
     :ivar client: A dictionary of client information (including remote host and port)
-    :ivar headers: A dictionary of HTTP request headers
+    :ivar headers: A :class:`~backendpy.request.Headers` case-insensitive mapping of HTTP request headers
+    :ivar cookies: A dictionary of HTTP request cookies
     :ivar url_vars: A dictionary of URL path variables
+    :ivar deadline: The time (in :func:`time.monotonic` clock) that the time budget of the request ends
+                    (or None if the request has no timeout)
     :ivar params: A dictionary of HTTP request query string values
     :ivar body: A :class:`~backendpy.request.RequestBody` class instance
     """
 
+    # The instance dict (which is only created when it is used) keeps the custom attributes that the
+    # applications and middlewares set on the requests (such as ``request.user``) working
+    __slots__ = ('app', 'context', 'method', 'path', 'root_path', 'scheme', 'url_vars', 'deadline',
+                 '_scope', '_body_receiver', '_server', '_client', '_headers', '_params', '_cookies', '_body',
+                 '_data_handler', '_background_tasks', '__dict__')
+
     def __init__(
             self,
             app: Backendpy,
             scope: Mapping[str, Any],
             body_receiver: Optional[Callable[..., Awaitable[dict]]] = None,
-            url_vars: Optional[dict[str, str]] = None) -> None:
+            url_vars: Optional[dict[str, Any]] = None) -> None:
         """
         Initialize request instance.
 
@@ -63,36 +78,104 @@ class Request:
         """
         self.app: Backendpy = app
         self.context: dict[str, Any] = {}
-        self.method: Optional[str] = None
-        self.path: Optional[str] = None
-        self.root_path: Optional[str] = None
-        self.scheme: Optional[str] = None
-        self.server: Optional[dict[str, Any]] = None
-        self.client: Optional[dict[str, Any]] = None
-        self.headers: Optional[dict[str, str]] = None
-        self.url_vars: Optional[dict[str, str]] = url_vars
-        self.params: Optional[dict[str, str | list[str]]] = None
+        self.method: str = scope['method']
+        self.path: str = scope['path']
+        self.root_path: str = scope['root_path']
+        self.scheme: str = scope['scheme']
+        self.url_vars: Optional[dict[str, Any]] = url_vars
+        self.deadline: Optional[float] = None
+        self._scope = scope
+        self._body_receiver = body_receiver
+        self._server: Optional[dict[str, Any]] = None
+        self._client: Optional[dict[str, Any]] = None
+        self._headers: Optional[Headers] = None
+        self._params: Optional[dict[str, str | list[str]]] = None
+        self._cookies: Optional[dict[str, str]] = None
+        self._body: Optional[RequestBody] = None
         self._data_handler: Optional[Type[Data]] = None
-        self._set_scope_data(scope)
-        self.body: RequestBody = RequestBody(content_type=self.headers.get('content-type'),
-                                             receiver=body_receiver)
-
-    def _set_scope_data(self, scope: Mapping[str, Any]) -> None:
-        """Set request information from HTTP connection scope."""
-        if scope.get('server'):
-            self.server = {'host': scope['server'][0],
-                           'port': scope['server'][1]}
-        if scope.get('client'):
-            self.client = {'ip': scope['client'][0],
-                           'port': scope['client'][1]}
-        self.method = scope['method']
-        self.path = scope['path']
-        self.root_path = scope['root_path']
-        self.scheme = scope['scheme']
-        self.headers = {k.decode(): v.decode() for k, v in scope['headers']}
-        if scope.get('query_string'):
-            self.params = {k: (v[-1] if not k.endswith('[]') else v)
-                           for k, v in parse_qs(scope['query_string'].decode('utf8')).items()}
+        self._background_tasks: Optional[list[Coroutine]] = None
+
+    @property
+    def server(self) -> Optional[dict[str, Any]]:
+        if self._server is None and self._scope.get('server'):
+            self._server = {'host': self._scope['server'][0],
+                            'port': self._scope['server'][1]}
+        return self._server
+
+    @property
+    def client(self) -> Optional[dict[str, Any]]:
+        if self._client is None and self._scope.get('client'):
+            self._client = {'ip': self._scope['client'][0],
+                            'port': self._scope['client'][1]}
+        return self._client
+
+    @property
+    def headers(self) -> Headers:
+        if self._headers is None:
+            self._headers = Headers(self._scope['headers'])
+        return self._headers
+
+    @headers.setter
+    def headers(self, value: Headers | Mapping[str, str]) -> None:
+        if not isinstance(value, Headers):
+            # The names that only differ in case are the same header
+            value = Headers([(k.encode(), v.encode()) for k, v in {k.lower(): v for k, v in value.items()}.items()])
+        self._headers = value
+        # The cookies are parsed again from the assigned headers
+        self._cookies = None
+
+    @property
+    def params(self) -> Optional[dict[str, str | list[str]]]:
+        if self._params is None and self._scope.get('query_string'):
+            self._params = {k: (v[-1] if not k.endswith('[]') else v)
+                            for k, v in parse_qs(self._scope['query_string'].decode('utf8')).items()}
+        return self._params
+
+    @params.setter
+    def params(self, value: Optional[dict[str, str | list[str]]]) -> None:
+        self._params = value
+
+    @property
+    def cookies(self) -> dict[str, str]:
+        if self._cookies is None:
+            self._cookies = dict()
+            for header in self.headers.getlist('cookie'):
+                for item in header.split(';'):
+                    name, separator, value = item.partition('=')
+                    name = name.strip()
+                    if separator and name:
+                        self._cookies[name] = value.strip().strip('"')
+        return self._cookies
+
+    @property
+    def body(self) -> RequestBody:
+        if self._body is None:
+            self._body = RequestBody(content_type=self.headers.get('content-type'),
+                                     receiver=self._body_receiver)
+        return self._body
+
+    @property
+    def remaining_time(self) -> Optional[float]:
+        """
+        Return the remaining time budget of the request in seconds (or None if the request has no timeout).
+        It can be used to limit the timeouts of the operations of the request, such as the outbound calls.
+        """
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def add_background_task(self, coro: Coroutine) -> None:
+        """
+        Add a task to be executed in the background after the response is sent.
+
+        The tasks are added to the project background tasks queue after sending the response,
+        and are executed by its worker tasks.
+
+        :param coro: The coroutine object of the task (e.g. ``send_email(address)``)
+        """
+        if self._background_tasks is None:
+            self._background_tasks = list()
+        self._background_tasks.append(coro)
 
     async def get_cleaned_data(self) -> Optional[dict[str, Any]]:
         """Return a dictionary of data processed by request data handler"""
@@ -111,6 +194,130 @@ class Request:
             return None
 
 
+class Headers(Mapping):
+    """
+    A read-only case-insensitive mapping of the HTTP request headers, which is a view of the raw ASGI headers list
+    (the header values are decoded on lookup).
+
+    Looking up a repeated header returns its last value, and all of its values are returned by :meth:`getlist`.
+    """
+
+    __slots__ = ('_raw', '_dict')
+
+    def __init__(self, raw: Iterable[tuple[bytes, bytes]]) -> None:
+        """
+        Initialize the headers.
+
+        :param raw: The ASGI list of the header name and value pairs (with lowercase names)
+        """
+        self._raw = raw if type(raw) is list or type(raw) is tuple else list(raw)
+        self._dict: Optional[dict[str, str]] = None
+
+    @property
+    def raw(self) -> list[tuple[bytes, bytes]] | tuple[tuple[bytes, bytes], ...]:
+        """Get the raw ASGI headers list."""
+        return self._raw
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._dict is not None:
+            return self._dict.get(key.lower(), default)
+        name = key.lower().encode()
+        for k, v in reversed(self._raw):
+            if k == name:
+                return v.decode()
+        return default
+
+    def getlist(self, key: str) -> list[str]:
+        """Return all the values of a header in their order."""
+        name = key.lower().encode()
+        return [v.decode() for k, v in self._raw if k == name]
+
+    def keys(self) -> KeysView[str]:
+        return self._to_dict().keys()
+
+    def values(self) -> ValuesView[str]:
+        return self._to_dict().values()
+
+    def items(self) -> ItemsView[str, str]:
+        return self._to_dict().items()
+
+    def __getitem__(self, key: str) -> str:
+        if self._dict is not None:
+            return self._dict[key.lower()]
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        if type(key) is not str:
+            return False
+        name = key.lower().encode()
+        for k, _ in self._raw:
+            if k == name:
+                return True
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._to_dict())
+
+    def __len__(self) -> int:
+        return len(self._to_dict())
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._to_dict()!r})'
+
+    def _to_dict(self) -> dict[str, str]:
+        if self._dict is None:
+            self._dict = {k.decode(): v.decode() for k, v in self._raw}
+        return self._dict
+
+
+_MISSING = object()
+
+
+class DisconnectWatcher:
+    """
+    A watcher of the ASGI ``receive`` channel of a request that detects the client disconnection.
+
+    The watcher is the only reader of the channel, and passes the received messages (such as the
+    request body chunks) to the request through its ``receive`` method. The messages that the request
+    has not read yet are buffered, so the disconnection is detected even if the body is not read.
+    """
+
+    def __init__(self, receive: Callable[..., Awaitable[dict]]) -> None:
+        self._receive = receive
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self.disconnected = False
+
+    def start(self, on_disconnect: Callable[[], Any]) -> None:
+        """Start watching the channel.
+
+        :param on_disconnect: A function which is called when the client is disconnected
+        """
+        self._task = asyncio.ensure_future(self._watch(on_disconnect))
+
+    def stop(self) -> None:
+        """Stop watching the channel."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def receive(self) -> dict:
+        """Receive the next message of the channel."""
+        return await self._messages.get()
+
+    async def _watch(self, on_disconnect):
+        while True:
+            message = await self._receive()
+            self._messages.put_nowait(message)
+            if message['type'] == 'http.disconnect':
+                self.disconnected = True
+                on_disconnect()
+                return
+
+
 class RequestBody:
     """
     HTTP request body class whose instances are used to store the information of a request
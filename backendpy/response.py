@@ -71,6 +71,7 @@ class Status(IntEnum):
     UNSUPPORTED_MEDIA_TYPE = (415, 'Unsupported Media Type')
     REQUESTED_RANGE_NOT_SATISFIABLE = (416, 'Requested Range Not Satisfiable')
     EXPECTATION_FAILED = (417, 'Expectation Failed')
+    TOO_MANY_REQUESTS = (429, 'Too Many Requests')
     INTERNAL_SERVER_ERROR = (500, 'Internal Server Error')
     NOT_IMPLEMENTED = (501, 'Not Implemented')
     BAD_GATEWAY = (502, 'Bad Gateway')
@@ -124,17 +125,39 @@ class Response:
         :return: Tuple of generated response info
         """
         stream = self._is_stream(self.body)
-        if not stream:
+        head = request.method == 'HEAD'
+        if stream and head:
+            # The body of a HEAD response is not sent, so its stream is closed without being consumed
+            if isinstance(self.body, types.AsyncGeneratorType):
+                await self.body.aclose()
+            else:
+                self.body.close()
+        elif not stream:
             self.body = to_bytes(self.body)
-        self.headers = list(self.headers) if self.headers else []
+        self.headers = self._normalize_headers(self.headers)
         if self.compress:
-            self.body = self._gzip(self.body) if not stream else self._gzip_stream(self.body)
+            if not stream:
+                self.body = self._gzip(self.body)
+            elif not head:
+                self.body = self._gzip_stream(self.body)
             self.headers += [[b'content-encoding', b'deflate' if stream else b'gzip']]
         self.headers += [[b'content-type', self.content_type]]
         if not stream:
             self.headers += [[b'content-length', to_bytes(len(self.body))]]
+        if head:
+            # The headers of a HEAD response are the same as the GET response
+            self.body = b''
+            return self.body, self.status.value, self.headers, False
         return self.body, self.status.value, self.headers, stream
 
+    @staticmethod
+    def _normalize_headers(headers: Optional[Iterable[[bytes, bytes]]]) -> list[[bytes, bytes]]:
+        """Return the list of the headers with the lowercase bytes names (the headers added by the response
+        classes themselves are already normalized)."""
+        if not headers:
+            return []
+        return [[name.lower() if type(name) is bytes else to_bytes(name).lower(), value] for name, value in headers]
+
     @staticmethod
     def _gzip(body: Any) -> bytes:
         """Gzip the response body"""
@@ -318,8 +341,9 @@ class File(Response):
         path = os.path.join(request.app.config['environment']['media_path'], unquote(self.path))
         if not os.path.isfile(path):
             raise FileNotFoundError
+        head = request.method == 'HEAD'
 
-        self.headers = list(self.headers) if self.headers else []
+        self.headers = self._normalize_headers(self.headers)
         content_type, encoding = guess_type(path)
         self.headers += [[b'content-type', to_bytes(content_type) if content_type else self.content_type],
                          [b'accept-ranges', b'bytes' if self.partial else b'none']]
@@ -352,7 +376,9 @@ class File(Response):
                 self.status = Status.REQUESTED_RANGE_NOT_SATISFIABLE
                 return self.body, self.status.value, self.headers, False
             self.status = Status.PARTIAL_CONTENT
-            if self.stream:
+            if head:
+                self.body = b''
+            elif self.stream:
                 self.body = read_file_chunks(
                     path,
                     chunk_size=int(request.app.config['networking']['stream_size']),
@@ -365,6 +391,9 @@ class File(Response):
                     end_index=range_end)
             self.headers += [[b'content-range', to_bytes(f'bytes {range_start}-{range_end}/{total_length}')],
                              [b'content-length', to_bytes(range_end-range_start+1)]]
+        elif head:
+            file_stat = await aiofiles.os.stat(path)
+            self.headers += [[b'content-length', to_bytes(file_stat.st_size)]]
         else:
             if self.stream:
                 self.body = read_file_chunks(path, int(request.app.config['networking']['stream_size']))
@@ -384,7 +413,7 @@ class File(Response):
             self.headers += [[b'last-modified', to_bytes(self.last_modified)]]
         if self.entity_tag is not None:
             self.headers += [[b'etag', to_bytes(self.entity_tag)]]
-        return self.body, self.status.value, self.headers, self.stream
+        return self.body, self.status.value, self.headers, self.stream and not head
 
 
 class Redirect(Response):
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-import operator
 import re
+import sys
+import uuid
+from collections import OrderedDict
 from collections.abc import Iterable
-from typing import Type, Optional, AnyStr
+from typing import Type, Optional, Any
 
+from .admission import Bulkhead
 from .data_handler.data import Data
+from .threadpool import to_async
 
 
 class Route:
@@ -17,37 +21,88 @@ class Route:
             methods: Iterable[str],
             handler: callable,
             data_handler = None,
-            only_ssl: bool = False) -> None:
+            only_ssl: bool = False,
+            hosts: Optional[Iterable[str]] = None,
+            middlewares: Optional[Iterable[Any]] = None,
+            timeout: Optional[float] = None,
+            bulkhead: Optional[Bulkhead] = None) -> None:
         """
         Initialize the route instance.
 
         :param path: Route path
         :param methods: List of acceptable HTTP methods for this route including
                         ``GET``, ``POST``, ``PUT``, ``PATCH``, ``DELETE``, ``HEAD`` & ``OPTIONS``
-        :param handler: An async function that responds to requests to this route
+        :param handler: A function that responds to requests to this route (synchronous
+                        functions are executed in the project thread pool)
         :param data_handler: A class of type :class:`~backendpy.data_handler.data.Data`
                              that processes input data before sending it to the handler function
         :param only_ssl: Determines whether only the https schema is acceptable
+        :param hosts: List of host patterns (exact hosts like ``example.com`` or wildcard subdomains
+                      like ``*.example.com``) that this route is bound to. If it is not set, the route
+                      is shared between all the hosts.
+        :param middlewares: List of middlewares (classes, instances or their dotted paths) that are only
+                            executed for the requests of this route, after the project middlewares
+        :param timeout: Time budget of the requests of this route in seconds (the default is the timeout
+                        of the routes group or the project ``request_timeout`` config)
+        :param bulkhead: The :class:`~backendpy.admission.Bulkhead` that limits the concurrent requests of
+                         this route (the default is the bulkhead of the routes group or the application)
         """
         self.path = path
         self.methods = tuple(methods)
         self.data_handler = data_handler
-        self.handler = handler
+        self.handler = to_async(handler)
         self.only_ssl = only_ssl
+        self.hosts = tuple(hosts) if hosts else None
+        self.middlewares = tuple(middlewares) if middlewares else None
+        self.timeout = timeout
+        self.bulkhead = bulkhead
 
 
 class Routes:
     """A class for holding a list of :class:`~backendpy.router.Route`s"""
 
-    def __init__(self, *args: Route) -> None:
+    def __init__(self,
+                 *args: Route,
+                 hosts: Optional[Iterable[str]] = None,
+                 middlewares: Optional[Iterable[Any]] = None,
+                 timeout: Optional[float] = None,
+                 bulkhead: Optional[Bulkhead] = None) -> None:
         """
         Initialize the Routes instance.
         :param args: Instances of the :class:`~backendpy.router.Route` class as arguments
+        :param hosts: List of host patterns that the routes without their own hosts are bound to
+                      (see :class:`~backendpy.router.Route`)
+        :param middlewares: List of middlewares that are executed for the requests of these routes,
+                            before the middlewares of each route (see :class:`~backendpy.router.Route`)
+        :param timeout: Time budget of the requests of the routes without their own timeout in seconds
+                        (see :class:`~backendpy.router.Route`)
+        :param bulkhead: The bulkhead of the routes without their own bulkhead (the bulkhead is shared
+                         between all these routes, see :class:`~backendpy.router.Route`)
         """
+        self.hosts = tuple(hosts) if hosts else None
+        self.middlewares = tuple(middlewares) if middlewares else None
+        self.timeout = timeout
+        self.bulkhead = bulkhead
         self._items: list[Route] = list()
+        self._mounts: list[tuple[str, callable]] = list()
         for route in args:
             self.append(route)
 
+    def mount(self, prefix: str, app: callable) -> None:
+        """
+        Mount an ASGI application under a path prefix.
+
+        The requests whose path is the prefix or is under it are dispatched directly to the mounted
+        application (without running the middlewares), with the prefix removed from the ``path``
+        (and the ``raw_path``) and added to the ``root_path`` of the ASGI scope.
+
+        :param prefix: URL path prefix (e.g. ``/legacy``)
+        :param app: ASGI application callable
+        """
+        if not callable(app):
+            raise ValueError("Invalid ASGI application")
+        self._mounts.append((prefix, app))
+
     def route(self,
               path: str,
               methods: Iterable[str],
@@ -152,6 +207,11 @@ class Routes:
         """Get routes list"""
         return self._items
 
+    @property
+    def mounts(self) -> list[tuple[str, callable]]:
+        """Get the list of mounted ASGI applications as (prefix, application) pairs"""
+        return self._mounts
+
     def extend(self, routes: Iterable[Route]) -> None:
         """Extend items"""
         if any(map(lambda route: type(route) is not Route, routes)):
@@ -169,6 +229,7 @@ class Routes:
         if not isinstance(other, self.__class__):
             raise TypeError(f"{type(self.__class__)} and {type(other)} cannot be merged.")
         self._items.extend(other.items)
+        self._mounts.extend(other.mounts)
 
     def __iter__(self):
         """Iter items"""
@@ -178,7 +239,10 @@ class Routes:
         """Concatenate items from two instances of the Routes class and return a new instance."""
         if not isinstance(other, self.__class__):
             raise TypeError(f"{type(self.__class__)} and {type(other)} cannot be concatenated.")
-        return self.__class__(*(self._items + other.items))
+        routes = self.__class__(*(self._items + other.items), hosts=self.hosts, middlewares=self.middlewares,
+                                timeout=self.timeout, bulkhead=self.bulkhead)
+        routes.mounts.extend(self._mounts + other.mounts)
+        return routes
 
 
 class TrieNode:
@@ -188,21 +252,12 @@ class TrieNode:
         """ Initialize the trie tree."""
         self._children: dict[str, TrieNode] = dict()
         self._pattern_children: dict[re.Pattern, TrieNode] = dict()
+        self._compiled_pattern_children: tuple[tuple[callable, TrieNode], ...] = ()
+        self._path_child: Optional[TrieNode] = None
+        self._min_depth: int = 0
+        self._max_depth: int = -1
         self.route: Optional[dict] = None
-        self.priority_order: Optional[list[int]] = None
-
-    def get_candidate_nodes(self, key: str, remaining_count: int) -> list[TrieNode]:
-        nodes = []
-        ch = self._children.get(key)
-        if ch is not None \
-                and (remaining_count > 1 or ch.route is not None):
-            nodes.append(ch)
-        if self._pattern_children:
-            for pattern, ch in self._pattern_children.items():
-                if remaining_count > 1 or ch.route is not None:
-                    if pattern.fullmatch(key):
-                        nodes.append(ch)
-        return nodes
+        self.priority_order: tuple[int, ...] = ()
 
     def set_default_node(self, key: str):
         if key not in self._children:
@@ -214,13 +269,90 @@ class TrieNode:
             self._pattern_children[pattern] = TrieNode()
         return self._pattern_children[pattern]
 
+    def set_default_path_node(self):
+        if self._path_child is None:
+            self._path_child = TrieNode()
+        return self._path_child
+
+    def compile(self) -> None:
+        """
+        Prepare the subtree for matching by caching the pattern matchers of the children
+        and the range of path lengths (in parts) that can reach a route from this node.
+        """
+        self._compiled_pattern_children = tuple(
+            (pattern.fullmatch, ch) for pattern, ch in self._pattern_children.items())
+        depths = [0] if self.route is not None else []
+        for ch in (*self._children.values(), *self._pattern_children.values()):
+            ch.compile()
+            if ch._max_depth >= 0:
+                depths += [ch._min_depth + 1, ch._max_depth + 1]
+        if self._path_child is not None and self._path_child.route is not None:
+            # A path var matches all the remaining parts
+            depths += [1, sys.maxsize]
+        self._min_depth, self._max_depth = (min(depths), max(depths)) if depths else (0, -1)
+
+    def match(self, parts: list[str], index: int = 0) -> Optional[TrieNode]:
+        """
+        Find the node of the highest priority route that matches the path parts in a single
+        depth-first pass.
+
+        A static child always has priority over pattern children, so its subtree is tried first
+        and a match there ends the search. Pattern children are only compared with each other
+        (by the ``priority_order`` of their matched routes) and ties are won by the first defined.
+        A path var child, which takes all the remaining parts, has the lowest priority.
+        """
+        remaining = len(parts) - index
+        if remaining < self._min_depth or remaining > self._max_depth:
+            return None
+        if not remaining:
+            return self
+        part = parts[index]
+        ch = self._children.get(part)
+        if ch is not None:
+            node = ch.match(parts, index + 1)
+            if node is not None:
+                return node
+        best = None
+        for fullmatch, ch in self._compiled_pattern_children:
+            if fullmatch(part) is not None:
+                node = ch.match(parts, index + 1)
+                if node is not None and (best is None or node.priority_order > best.priority_order):
+                    best = node
+        if best is None and self._path_child is not None and self._path_child.route is not None:
+            return self._path_child
+        return best
+
+    def match_all(self, parts: list[str], index: int = 0) -> list[TrieNode]:
+        """Find the nodes of all the routes that match the path parts (regardless of their priority)."""
+        remaining = len(parts) - index
+        if remaining < self._min_depth or remaining > self._max_depth:
+            return []
+        if not remaining:
+            return [self]
+        part = parts[index]
+        nodes = []
+        ch = self._children.get(part)
+        if ch is not None:
+            nodes += ch.match_all(parts, index + 1)
+        for fullmatch, ch in self._compiled_pattern_children:
+            if fullmatch(part) is not None:
+                nodes += ch.match_all(parts, index + 1)
+        if self._path_child is not None and self._path_child.route is not None:
+            nodes.append(self._path_child)
+        return nodes
+
 
 class Router:
     """A class for routing requests based on the trie tree of routes path parts."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = 0, not_found_cache_size: int = 0) -> None:
         """
         Initialize the router trees root node.
+
+        :param cache_size: Maximum number of matched lookups kept in the LRU lookup cache
+                           (the cache is disabled if it is 0)
+        :param not_found_cache_size: Maximum number of unmatched lookups kept in a separate LRU cache
+                                     (the cache is disabled if it is 0)
         """
         self._route_tree_root: dict[str, TrieNode] = {
             'GET': TrieNode(),
@@ -230,6 +362,26 @@ class Router:
             'DELETE': TrieNode(),
             'OPTIONS': TrieNode(),
             'HEAD': TrieNode()}
+        self._static_routes: dict[str, dict[str, dict]] = {
+            method: dict() for method in self._route_tree_root}
+        # A tree of the routes of all methods used to find the allowed methods of a path
+        self._allowed_methods_root = TrieNode()
+        self._static_allowed_methods: dict[str, Optional[bytes]] = dict()
+        self._routes: list[Route] = list()
+        self._all_routes: list[tuple[Route, Optional[tuple[str, ...]], dict[str, Any]]] = list()
+        self._prefix_middlewares: list[tuple[str, tuple[Any, ...]]] = list()
+        self._scoped_routes: list[tuple[dict, tuple[Any, ...]]] = list()
+        self._exact_host_routers: dict[str, Router] = dict()
+        self._wildcard_host_routers: dict[str, Router] = dict()
+        self._mounts: list[tuple[str, callable]] = list()
+        self._compiled = False
+        self._cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str, str], tuple] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._not_found_cache_size = not_found_cache_size
+        self._not_found_cache: OrderedDict[tuple[str, str, str], Optional[bytes]] = OrderedDict()
+        self._not_found_cache_hits = 0
 
     @staticmethod
     def _is_var_part(part: str):
@@ -239,90 +391,460 @@ class Router:
     def _is_pattern_part(part: str):
         return part.startswith('(') and part.endswith(')')
 
-    def append(self, route: Route):
+    @classmethod
+    def _is_path_var_part(cls, part: str):
+        return cls._is_var_part(part) and part[1:-1].endswith(':path')
+
+    @classmethod
+    def _is_dynamic_part(cls, part: str):
+        return cls._is_var_part(part) or cls._is_pattern_part(part)
+
+    @staticmethod
+    def _normalize_path(path: str) -> str:
+        return '/' + '/'.join(part for part in path.split('/') if part)
+
+    def append(self,
+               route: Route,
+               hosts: Optional[Iterable[str]] = None,
+               middlewares: Optional[Iterable[Any]] = None,
+               timeout: Optional[float] = None,
+               bulkhead: Optional[Bulkhead] = None):
+        """
+        Append a route to the router.
+
+        :param route: The route
+        :param hosts: Host patterns of the routes group (used if the route has no hosts)
+        :param middlewares: Middlewares of the routes group (executed before the route middlewares)
+        :param timeout: Timeout of the routes group (used if the route has no timeout)
+        :param bulkhead: Bulkhead of the routes group (used if the route has no bulkhead)
+        """
+        self._compiled = False
+        self.cache_clear()
+        hosts = route.hosts or (tuple(hosts) if hosts else None)
+        middlewares = tuple(middlewares) if middlewares else ()
+        self._all_routes.append((route, hosts, {'middlewares': middlewares, 'timeout': timeout,
+                                                'bulkhead': bulkhead}))
+        if hosts:
+            # Host bound routes are only added to the trees of their hosts routers
+            return
+        self._append_unbound(route, middlewares, timeout, bulkhead)
+
+    def _append_unbound(self,
+                        route: Route,
+                        middlewares: Iterable[Any] = (),
+                        timeout: Optional[float] = None,
+                        bulkhead: Optional[Bulkhead] = None) -> None:
+        """Add a route to the trees of this router regardless of its hosts."""
+        middlewares = tuple(middlewares)
+        self._routes.append(route)
+        route_path_parts = [part for part in route.path.split('/') if part]
+        is_static = not any(map(self._is_dynamic_part, route_path_parts))
         for method in route.methods:
-            curr = self._route_tree_root[method]
-            if route.path in ('/', ''):
-                curr.route = {
-                    'handler': route.handler,
-                    'data_handler': route.data_handler,
-                    'ssl': route.only_ssl}
+            curr, path_vars = self._set_default_nodes(self._route_tree_root[method], route_path_parts, route.path)
+            curr.route = {
+                'path': route.path,
+                'handler': route.handler,
+                'data_handler': route.data_handler,
+                'path_vars': path_vars,
+                'ssl': route.only_ssl,
+                'timeout': route.timeout if route.timeout is not None else timeout,
+                'bulkhead': route.bulkhead or bulkhead,
+                'middleware_processor': None}
+            self._scoped_routes.append((curr.route, middlewares + (route.middlewares or ())))
+            allowed, _ = self._set_default_nodes(self._allowed_methods_root, route_path_parts, route.path)
+            if allowed.route is None:
+                allowed.route = {'methods': set()}
+            allowed.route['methods'].add(method)
+            if is_static:
+                # Fully static routes are also kept in exact-match tables
+                # that are checked before walking the trees
+                self._static_routes[method][self._normalize_path(route.path)] = curr.route
+                self._static_allowed_methods[self._normalize_path(route.path)] = None
+
+    def _set_default_nodes(self, root: TrieNode, route_path_parts: list[str], route_path: str) \
+            -> tuple[TrieNode, tuple[tuple[str, int, Optional[callable], bool], ...]]:
+        """Create the nodes of the route path parts in the tree and return the last node and the path vars."""
+        curr = root
+        path_vars = []
+        for i, part in enumerate(route_path_parts):
+            key, var_name, var_type = self._parse_part(part, route_path)
+            if var_type == 'path':
+                if i != len(route_path_parts) - 1:
+                    raise ValueError(f'The path var must be the last part of the route path: "{route_path}"')
+                curr = curr.set_default_path_node()
+            elif isinstance(key, re.Pattern):
+                curr = curr.set_default_pattern_node(key)
             else:
-                route_path_parts = route.path.split('/')
-                var_indexes = {}
-                priority_order = []
-                for i, part in enumerate(route_path_parts):
-                    if part:
-                        if self._is_var_part(part):
-                            part = part[1:-1]
-                            var_name, var_type = part.split(':', 1) if ':' in part else (part, 'str')
-                            if var_type in PREDEFINED_REGEXES:
-                                pattern = PREDEFINED_REGEXES[var_type]
-                            elif self._is_pattern_part(var_type):
-                                try:
-                                    pattern = re.compile(var_type)
-                                except re.error:
-                                    raise ValueError(f'Invalid regex pattern in the route path: "{route.path}"')
-                            else:
-                                raise ValueError(f'Invalid var type in the route path: "{route.path}"')
-                            curr = curr.set_default_pattern_node(pattern)
-                            priority_order.append(0)
-                            var_indexes[var_name] = i
-                        elif self._is_pattern_part(part):
-                            try:
-                                curr = curr.set_default_pattern_node(re.compile(part))
-                                priority_order.append(0)
-                            except re.error:
-                                raise ValueError(f'Invalid regex pattern in the route path: "{route.path}"')
-                        else:
-                            curr = curr.set_default_node(part)
-                            priority_order.append(1)
-                curr.route = {
-                    'handler': route.handler,
-                    'data_handler': route.data_handler,
-                    'path_var_indexes': var_indexes,
-                    'ssl': route.only_ssl}
-                curr.priority_order = priority_order
-
-    def extend(self, routes: Iterable[Route] | Routes):
+                curr = curr.set_default_node(key)
+            if var_name is not None:
+                path_vars.append((var_name, i, PREDEFINED_CONVERTERS.get(var_type), var_type == 'path'))
+        curr.priority_order = tuple(
+            (-1 if self._is_path_var_part(part) else 0) if self._is_dynamic_part(part) else 1
+            for part in route_path_parts)
+        return curr, tuple(path_vars)
+
+    def _parse_part(self, part: str, route_path: str) \
+            -> tuple[Optional[str | re.Pattern], Optional[str], Optional[str]]:
+        """
+        Parse a route path part and return its tree key (a string, a regex pattern or None for a path var)
+        and the name and type of its var (if it is a var part).
+        """
+        if self._is_var_part(part):
+            part = part[1:-1]
+            var_name, var_type = part.split(':', 1) if ':' in part else (part, 'str')
+            if var_type == 'path':
+                return None, var_name, var_type
+            if var_type in PREDEFINED_REGEXES:
+                return PREDEFINED_REGEXES[var_type], var_name, var_type
+            if self._is_pattern_part(var_type):
+                try:
+                    return re.compile(var_type), var_name, var_type
+                except re.error:
+                    raise ValueError(f'Invalid regex pattern in the route path: "{route_path}"')
+            raise ValueError(f'Invalid var type in the route path: "{route_path}"')
+        elif self._is_pattern_part(part):
+            try:
+                return re.compile(part), None, None
+            except re.error:
+                raise ValueError(f'Invalid regex pattern in the route path: "{route_path}"')
+        return part, None, None
+
+    def extend(self,
+               routes: Iterable[Route] | Routes,
+               hosts: Optional[Iterable[str]] = None,
+               bulkhead: Optional[Bulkhead] = None):
+        options = {'bulkhead': bulkhead}
+        if isinstance(routes, Routes):
+            if routes.hosts:
+                hosts = routes.hosts
+            options = {'middlewares': routes.middlewares, 'timeout': routes.timeout,
+                       'bulkhead': routes.bulkhead or bulkhead}
+            for prefix, app in routes.mounts:
+                self.mount(prefix, app)
         for route in routes:
-            self.append(route)
+            self.append(route, hosts, **options)
 
-    def lookup(self, path: str, method: str, scheme: str) \
-            -> tuple[Optional[callable], Optional[Type[Data]], Optional[dict[str, AnyStr]]]:
+    def add_middlewares(self, prefix: str, middlewares: Iterable[Any]) -> None:
+        """
+        Attach middlewares to the routes whose path is under a prefix.
+
+        The middlewares of the prefixes are executed for the requests of the matched routes, after the
+        project middlewares and before the middlewares of the routes groups and the routes themselves.
+
+        :param prefix: URL path prefix (e.g. ``/admin``)
+        :param middlewares: List of middlewares (classes, instances or their dotted paths)
+        """
+        self._compiled = False
+        self.cache_clear()
+        self._prefix_middlewares.append((self._normalize_path(prefix), tuple(middlewares)))
+
+    def mount(self, prefix: str, app: callable) -> None:
+        """
+        Mount an ASGI application under a path prefix (mounts are not bound to hosts).
+
+        .. seealso:: :func:`~backendpy.router.Routes.mount`
+        """
+        prefix = self._normalize_path(prefix)
+        if prefix == '/':
+            raise ValueError('ASGI applications cannot be mounted at the root path')
+        if any(p == prefix for p, _ in self._mounts):
+            raise ValueError(f'An ASGI application is already mounted at "{prefix}"')
+        self._mounts.append((prefix, app))
+        # Longest prefixes are checked first
+        self._mounts.sort(key=lambda mount: len(mount[0]), reverse=True)
+
+    @property
+    def has_mounts(self) -> bool:
+        """Whether any ASGI application is mounted."""
+        return bool(self._mounts)
+
+    def match_mount(self, path: str) -> Optional[tuple[str, callable]]:
+        """
+        Find the mounted ASGI application of a path.
+
+        :param path: URL path
+        :return: A tuple of the mount prefix and the ASGI application, or None if the path is not under any mount
+        """
+        for prefix, app in self._mounts:
+            if path.startswith(prefix) and (len(path) == len(prefix) or path[len(prefix)] == '/'):
+                return prefix, app
+        return None
+
+    @property
+    def bulkheads(self) -> list[Bulkhead]:
+        """Get the bulkheads of the routes."""
+        return list(dict.fromkeys(route.bulkhead or options['bulkhead'] for route, _, options in self._all_routes
+                                  if route.bulkhead or options['bulkhead']))
+
+    @property
+    def host_routers(self) -> dict[str, Router]:
+        """Get the routers of the host patterns (each router contains the routes of a host and the shared routes)."""
+        if not self._compiled:
+            self.compile()
+        return {**{h: r for h, r in self._exact_host_routers.items()},
+                **{f'*{h}': r for h, r in self._wildcard_host_routers.items()}}
+
+    def compile(self) -> None:
+        """Compile the route trees for matching (called once after all routes are appended)."""
+        self._exact_host_routers.clear()
+        self._wildcard_host_routers.clear()
+        for pattern in dict.fromkeys(h.lower() for _, hosts, _ in self._all_routes if hosts for h in hosts):
+            router = Router(cache_size=self._cache_size, not_found_cache_size=self._not_found_cache_size)
+            router._prefix_middlewares = self._prefix_middlewares
+            for route, hosts, options in self._all_routes:
+                if not hosts or pattern in map(str.lower, hosts):
+                    router._append_unbound(route, **options)
+            router.compile()
+            if pattern.startswith('*.'):
+                self._wildcard_host_routers[pattern[1:]] = router
+            else:
+                self._exact_host_routers[pattern] = router
+        for root in self._route_tree_root.values():
+            root.compile()
+        self._allowed_methods_root.compile()
+        for path in self._static_allowed_methods:
+            self._static_allowed_methods[path] = self._get_allow([part for part in path.split('/') if part])
+        self._compile_middlewares()
+        self._compiled = True
+
+    def _compile_middlewares(self) -> None:
+        """Resolve the middlewares chain of each route once and set its compiled processor."""
+        from .middleware.middleware import MiddlewareProcessor
+        processors: dict[tuple[int, ...], MiddlewareProcessor] = dict()
+        instances: dict[int, Any] = dict()
+        prefix_middlewares = sorted(self._prefix_middlewares, key=lambda i: len(i[0]))
+        for route, middlewares in self._scoped_routes:
+            path = self._normalize_path(route['path'])
+            chain = tuple(m for prefix, items in prefix_middlewares
+                          if prefix == '/' or path == prefix or path.startswith(prefix + '/')
+                          for m in items) + middlewares
+            if not chain:
+                route['middleware_processor'] = None
+                continue
+            key = tuple(map(id, chain))
+            if key not in processors:
+                for m in chain:
+                    if id(m) not in instances:
+                        instances[id(m)] = MiddlewareProcessor.load_middleware(m)
+                processors[key] = MiddlewareProcessor(middlewares=[instances[id(m)] for m in chain])
+                processors[key].compile()
+            route['middleware_processor'] = processors[key]
+
+    def analyze(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Analyze the compiled route trees to find the overlapping routes of each method
+        and the worst-case fan-out of each route, which is the largest number of tree
+        branches that may have to be tried for a part of the paths matching the route.
+
+        :return: A dict of methods and the list of their routes info (including the ``path``,
+                 ``handler``, ``fan_out`` and ``overlaps`` items). Each overlap is a dict of the
+                 ``path`` of the other route and its ``kind`` that is ``duplicate`` (the same path
+                 is defined again and only the last one is used), ``ambiguous`` (the routes have
+                 the same priority and the first defined pattern is matched) or ``overlap``
+                 (the route with the higher priority is matched).
+        """
+        if not self._compiled:
+            self.compile()
+        report = dict()
+        for method, root in self._route_tree_root.items():
+            report[method] = list()
+            for route in self._routes:
+                if method not in route.methods:
+                    continue
+                keys = [self._parse_part(part, route.path)[0] for part in route.path.split('/') if part]
+                node = root
+                for key in keys:
+                    node = node._path_child if key is None else \
+                        (node._pattern_children if isinstance(key, re.Pattern) else node._children)[key]
+                fan_out = 1
+                overlaps = []
+                candidates = [root]
+                path_candidates = []
+                for key in keys:
+                    next_candidates = []
+                    for candidate in candidates:
+                        for child_key, ch in (*candidate._children.items(), *candidate._pattern_children.items()):
+                            if self._part_keys_overlap(key, child_key):
+                                next_candidates.append(ch)
+                        if candidate._path_child is not None:
+                            # A path var also matches all the remaining parts
+                            next_candidates.append(candidate._path_child)
+                            path_candidates.append(candidate._path_child)
+                    fan_out = max(fan_out, len(next_candidates))
+                    candidates = next_candidates
+                    if key is None:
+                        break
+                matched = [(ch, 'ambiguous' if ch.priority_order == node.priority_order else 'overlap')
+                           for ch in dict.fromkeys(candidates + path_candidates)
+                           if ch.route is not None and ch is not node]
+                if node.route['path'] != route.path or node.route['handler'] is not route.handler:
+                    matched.append((node, 'duplicate'))
+                for ch, kind in matched:
+                    overlaps.append({'path': ch.route['path'], 'kind': kind})
+                report[method].append({
+                    'path': route.path,
+                    'handler': route.handler,
+                    'fan_out': fan_out,
+                    'overlaps': overlaps})
+        return report
+
+    @staticmethod
+    def _part_keys_overlap(a: Optional[str | re.Pattern], b: Optional[str | re.Pattern]) -> bool:
+        """Return whether the two tree keys may match the same path part."""
+        if a is None or b is None or a == b:
+            return True
+        if isinstance(a, str):
+            return isinstance(b, re.Pattern) and b.fullmatch(a) is not None
+        if isinstance(b, str):
+            return a.fullmatch(b) is not None
+        if a in PREDEFINED_REGEXES.values() and b in PREDEFINED_REGEXES.values():
+            return any(a.fullmatch(sample) and b.fullmatch(sample) for sample in PREDEFINED_REGEXES_SAMPLES)
+        # The overlap of custom patterns cannot be determined
+        return True
+
+    def lookup(self, path: str, method: str, scheme: str, host: Optional[str] = None) \
+            -> tuple[Optional[callable], Optional[Type[Data]], Optional[dict[str, Any]]]:
         """
         Match the request information with the corresponding route and return the route handlers.
         :param path: Http request path
         :param method: Http request method
         :param scheme: Http request scheme
+        :param host: Http request host
         :return: A tuple that includes a request handler function, data handler class, and path variables dict.
         """
-        curr = [self._route_tree_root[method]]
-        if path in ('/', ''):
-            return (curr[0].route['handler'], curr[0].route['data_handler'], None) \
-                if curr[0].route is not None and (not curr[0].route['ssl'] or scheme == 'https') \
-                else (None, None, None)
-        else:
-            parts = path.split('/')
-            parts_size = len(parts)
-            for i, part in enumerate(parts):
-                if part:
-                    candidates = []
-                    for c in curr:
-                        candidates += c.get_candidate_nodes(
-                            part,
-                            remaining_count=parts_size-i)
-                    if not candidates:
-                        return None, None, None
-                    curr = candidates
-            if len(curr) == 1:
-                curr = curr[0]
-            else:
-                curr = max(curr, key=operator.attrgetter('priority_order'))
-            if curr.route['ssl'] and scheme != 'https':
-                return None, None, None
-            path_vars = {key: parts[index] for key, index in curr.route['path_var_indexes'].items()}
-            return curr.route['handler'], curr.route['data_handler'], (path_vars if path_vars else None)
+        route, path_vars, _ = self.resolve(path, method, scheme, host)
+        return (route['handler'], route['data_handler'], path_vars) if route is not None else (None, None, None)
+
+    def resolve(self, path: str, method: str, scheme: str, host: Optional[str] = None) \
+            -> tuple[Optional[dict[str, Any]], Optional[dict[str, Any]], Optional[bytes]]:
+        """
+        Match the request information with the corresponding route and return the route info.
+
+        ``HEAD`` requests fall back to the ``GET`` route of the path if no ``HEAD`` route is defined for it.
+        If the host matches the pattern of a host router, the request is only matched with the routes
+        of that router, otherwise with the routes that are not bound to any host.
+
+        :param path: Http request path
+        :param method: Http request method
+        :param scheme: Http request scheme
+        :param host: Http request host
+        :return: A tuple that includes the route info dict (or None), the path variables dict and
+                 the value of the ``Allow`` header if the path only matches the routes of other methods.
+        """
+        if not self._compiled:
+            self.compile()
+        if host and (self._exact_host_routers or self._wildcard_host_routers):
+            router = self._get_host_router(host)
+            if router is not None:
+                return router.resolve(path, method, scheme)
+        if not self._cache_size and not self._not_found_cache_size:
+            return self._resolve(path, method, scheme)
+        key = (method, scheme, path)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            route, path_vars = result
+            return route, (dict(path_vars) if path_vars else None), None
+        if key in self._not_found_cache:
+            self._not_found_cache.move_to_end(key)
+            self._not_found_cache_hits += 1
+            return None, None, self._not_found_cache[key]
+        self._cache_misses += 1
+        route, path_vars, allow = self._resolve(path, method, scheme)
+        if route is not None:
+            if self._cache_size:
+                self._cache[key] = (route, dict(path_vars) if path_vars else None)
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        elif self._not_found_cache_size:
+            self._not_found_cache[key] = allow
+            if len(self._not_found_cache) > self._not_found_cache_size:
+                self._not_found_cache.popitem(last=False)
+        return route, path_vars, allow
+
+    def cache_info(self) -> dict[str, int]:
+        """Return the statistics of the lookup caches to be used for sizing them."""
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'size': len(self._cache),
+            'max_size': self._cache_size,
+            'not_found_hits': self._not_found_cache_hits,
+            'not_found_size': len(self._not_found_cache),
+            'not_found_max_size': self._not_found_cache_size}
+
+    def cache_clear(self) -> None:
+        """Clear the lookup caches and their statistics."""
+        self._cache.clear()
+        self._not_found_cache.clear()
+        self._cache_hits = self._cache_misses = self._not_found_cache_hits = 0
+
+    def _get_host_router(self, host: str) -> Optional[Router]:
+        """Return the router of the exact host or of the most specific matching wildcard subdomain pattern."""
+        host = host.lower()
+        router = self._exact_host_routers.get(host)
+        if router is not None:
+            return router
+        if not host.endswith(']') and ':' in host:
+            # Remove the port
+            host = host.rsplit(':', 1)[0]
+            router = self._exact_host_routers.get(host)
+            if router is not None:
+                return router
+        if self._wildcard_host_routers:
+            i = host.find('.')
+            while i != -1:
+                router = self._wildcard_host_routers.get(host[i:])
+                if router is not None:
+                    return router
+                i = host.find('.', i + 1)
+        return None
+
+    def _resolve(self, path: str, method: str, scheme: str) \
+            -> tuple[Optional[dict[str, Any]], Optional[dict[str, Any]], Optional[bytes]]:
+        route, parts = self._match(path, method, None)
+        if route is None and method == 'HEAD':
+            route, parts = self._match(path, 'GET', parts)
+        if route is None:
+            allow = self._static_allowed_methods.get(path)
+            if allow is None:
+                allow = self._get_allow(parts if parts is not None else [part for part in path.split('/') if part])
+            return None, None, allow
+        if route['ssl'] and scheme != 'https':
+            return None, None, None
+        if not route['path_vars']:
+            return route, None, None
+        path_vars = {}
+        for name, index, converter, is_path in route['path_vars']:
+            value = '/'.join(parts[index:]) if is_path else parts[index]
+            path_vars[name] = converter(value) if converter is not None else value
+        return route, path_vars, None
+
+    def _get_allow(self, parts: list[str]) -> Optional[bytes]:
+        """Return the ``Allow`` header value of the methods of all the routes that match the path parts."""
+        methods = set()
+        for node in self._allowed_methods_root.match_all(parts):
+            methods |= node.route['methods']
+        if not methods:
+            return None
+        if 'GET' in methods:
+            methods.add('HEAD')
+        return ', '.join(m for m in self._route_tree_root if m in methods).encode()
+
+    def _match(self, path: str, method: str, parts: Optional[list[str]]) \
+            -> tuple[Optional[dict[str, Any]], Optional[list[str]]]:
+        """Return the matched route of the method (if any) and the path parts (if they are split)."""
+        static_routes = self._static_routes.get(method)
+        if static_routes is None:
+            return None, parts
+        route = static_routes.get(path)
+        if route is not None:
+            return route, parts
+        if parts is None:
+            parts = [part for part in path.split('/') if part]
+        node = self._route_tree_root[method].match(parts)
+        return (node.route if node is not None else None), parts
 
 
 PREDEFINED_REGEXES = {
@@ -331,6 +853,16 @@ PREDEFINED_REGEXES = {
     'float': re.compile(r'^([-+]?\d+\.\d+)$'),
     'uuid': re.compile(r'^([0-9a-f]{8}\-[0-9a-f]{4}\-4[0-9a-f]{3}\-[89ab][0-9a-f]{3}\-[0-9a-f]{12})$'),
     'slug': re.compile(r'^([-\w]+)$'),
-    # Todo: 'path'
     # Todo: 'any_of(a|b|c)'
 }
+
+# Samples used to check whether the predefined patterns overlap
+PREDEFINED_REGEXES_SAMPLES = (
+    'a', '1', '-1', '1.5', 'a-1', '3b241101-e2bb-4255-8caf-4136c566a962',
+)
+
+PREDEFINED_CONVERTERS = {
+    'int': int,
+    'float': float,
+    'uuid': uuid.UUID,
+}
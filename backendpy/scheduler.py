@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import hashlib
+import os
+import random
+import tempfile
+import time
+from typing import Optional, Any
+
+from .logging import get_logger
+from .threadpool import to_async
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LOGGER = get_logger(__name__)
+
+
+class Job:
+    """A class to define a periodic job"""
+
+    def __init__(
+            self,
+            func: callable,
+            interval: Optional[float] = None,
+            cron: Optional[str] = None,
+            jitter: float = 0,
+            leader_only: bool = False,
+            name: Optional[str] = None) -> None:
+        """
+        Initialize the job instance.
+
+        :param func: The function of the job without parameters (synchronous functions are executed
+                     in the project thread pool)
+        :param interval: Interval between the runs of the job in seconds
+        :param cron: Cron-style schedule of the job (``minute hour day month weekday``),
+                     used instead of the interval
+        :param jitter: Maximum random delay in seconds added to each run
+        :param leader_only: Whether the job is only run by the leader worker process of the project
+        :param name: The name of the job (the default is the function path)
+        """
+        if not callable(func):
+            raise TypeError('The "func" parameter must be a function.')
+        if (interval is None) == (cron is None):
+            raise ValueError('One of the "interval" or "cron" parameters must be set.')
+        if interval is not None and interval <= 0:
+            raise ValueError('The "interval" parameter must be positive.')
+        self.func = to_async(func)
+        self.interval = interval
+        self.cron = CronSchedule(cron) if cron is not None else None
+        self.jitter = jitter
+        self.leader_only = leader_only
+        self.name = name or f'{func.__module__}.{func.__qualname__}'
+
+    def get_delay(self, now: float) -> float:
+        """Return the delay in seconds until the next run of the job."""
+        if self.cron is not None:
+            delay = self.cron.get_next(datetime.datetime.fromtimestamp(now)).timestamp() - now
+        else:
+            delay = self.interval
+        return delay + random.uniform(0, self.jitter) if self.jitter else delay
+
+
+class Scheduler:
+    """Periodic jobs registry class"""
+
+    def __init__(self) -> None:
+        self._items: list[Job] = list()
+
+    @property
+    def items(self) -> list[Job]:
+        """Get registered jobs."""
+        return self._items
+
+    def register(self, job: Job) -> None:
+        """Register a job."""
+        if type(job) is not Job:
+            raise ValueError("Invalid job type")
+        self._items.append(job)
+
+    def every(self, seconds: float, jitter: float = 0, leader_only: bool = False) -> callable:
+        """Register an interval job with python decorator.
+
+        .. seealso:: :class:`~backendpy.scheduler.Job`
+        """
+        def decorator_register(func: callable) -> callable:
+            self.register(Job(func, interval=seconds, jitter=jitter, leader_only=leader_only))
+            return func
+        return decorator_register
+
+    def cron(self, schedule: str, jitter: float = 0, leader_only: bool = False) -> callable:
+        """Register a cron-style job with python decorator.
+
+        .. seealso:: :class:`~backendpy.scheduler.Job`
+        """
+        def decorator_register(func: callable) -> callable:
+            self.register(Job(func, cron=schedule, jitter=jitter, leader_only=leader_only))
+            return func
+        return decorator_register
+
+    def merge(self, other: Scheduler) -> None:
+        """Merge items from another Scheduler class instance with this instance."""
+        if not isinstance(other, self.__class__):
+            raise TypeError(f"{type(self.__class__)} and {type(other)} cannot be merged.")
+        self._items.extend(other.items)
+
+    def __iter__(self):
+        """Iter items"""
+        yield from self._items
+
+
+class SchedulerRunner:
+    """Class for running the project periodic jobs."""
+
+    def __init__(self, lock_path: Optional[str] = None) -> None:
+        """
+        Initialize the runner.
+
+        :param lock_path: Path of the lock file that is held by the leader worker process
+        """
+        self.scheduler = Scheduler()
+        self._lock_path = lock_path
+        self._lock_file = None
+        self._tasks: dict[Job, asyncio.Task] = dict()
+        self._stats: dict[str, dict[str, Any]] = dict()
+
+    @property
+    def is_started(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the statistics of the jobs keyed by the job names. Each item contains the ``runs`` and
+        ``errors`` counts, the ``skipped`` runs of the leader-only jobs in the non-leader processes,
+        and the ``last_run`` time (timestamp) and ``last_duration`` in seconds.
+        """
+        return self._stats
+
+    def acquire_leadership(self) -> bool:
+        """Try to become the leader of the project worker processes and return whether this process is the leader."""
+        if self._lock_file is not None:
+            return True
+        if self._lock_path is None or fcntl is None:
+            return True
+        lock_file = open(self._lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        LOGGER.debug(f'Process {os.getpid()} is the scheduler leader')
+        return True
+
+    async def start(self) -> None:
+        """Start running the registered jobs that are not started."""
+        for job in self.scheduler:
+            if job not in self._tasks:
+                self._stats[job.name] = {'runs': 0, 'errors': 0, 'skipped': 0,
+                                         'last_run': None, 'last_duration': None}
+                self._tasks[job] = asyncio.ensure_future(self._run(job))
+
+    async def stop(self) -> None:
+        """Stop running the jobs (running jobs are cancelled)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = dict()
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def _run(self, job: Job) -> None:
+        stats = self._stats[job.name]
+        while True:
+            # The next run is scheduled after the previous run is done, so the runs never overlap
+            await asyncio.sleep(job.get_delay(time.time()))
+            if job.leader_only and not self.acquire_leadership():
+                stats['skipped'] += 1
+                continue
+            start_time = time.perf_counter()
+            stats['last_run'] = time.time()
+            try:
+                await job.func()
+            except Exception as e:
+                stats['errors'] += 1
+                LOGGER.exception(f'"{job.name}" job error: {e}')
+            finally:
+                stats['runs'] += 1
+                stats['last_duration'] = time.perf_counter() - start_time
+
+
+class CronSchedule:
+    """A cron-style schedule (``minute hour day month weekday``), where weekday 0 or 7 is Sunday."""
+
+    _RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str) -> None:
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f'Invalid cron expression: "{expression}"')
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = \
+            (self._parse_field(field, *r, expression) for field, r in zip(fields, self._RANGES))
+        # Convert to python weekdays (Monday is 0)
+        self.weekdays = frozenset((d - 1) % 7 for d in weekdays)
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    @staticmethod
+    def _parse_field(field: str, minimum: int, maximum: int, expression: str) -> frozenset[int]:
+        values = set()
+        try:
+            for item in field.split(','):
+                item_range, _, step = item.partition('/')
+                if item_range == '*':
+                    start, end = minimum, maximum
+                elif '-' in item_range:
+                    start, end = map(int, item_range.split('-'))
+                else:
+                    start = end = int(item_range)
+                    if step:
+                        end = maximum
+                if start < minimum or end > maximum or start > end:
+                    raise ValueError
+                values.update(range(start, end + 1, int(step) if step else 1))
+        except ValueError:
+            raise ValueError(f'Invalid cron expression: "{expression}"')
+        return frozenset(values)
+
+    def _is_day_matched(self, date: datetime.datetime) -> bool:
+        day_matched = date.day in self.days
+        weekday_matched = date.weekday() in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_matched and weekday_matched
+        # When both of the day and weekday are restricted, matching one of them is enough
+        return day_matched or weekday_matched
+
+    def get_next(self, after: datetime.datetime) -> datetime.datetime:
+        """Return the next time of the schedule after a time."""
+        date = after.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = date + datetime.timedelta(days=366 * 5)
+        while date < limit:
+            if date.month not in self.months or not self._is_day_matched(date):
+                date = date.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif date.hour not in self.hours:
+                date = date.replace(minute=0) + datetime.timedelta(hours=1)
+            elif date.minute not in self.minutes:
+                date += datetime.timedelta(minutes=1)
+            else:
+                return date
+        raise ValueError(f'The cron expression never matches: "{self.expression}"')
+
+
+def get_default_lock_path(project_path: str) -> str:
+    """Return the default path of the scheduler leader lock file of a project."""
+    name = hashlib.sha1(os.path.abspath(project_path).encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f'backendpy-scheduler-{name}.lock')
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from inspect import iscoroutinefunction, isawaitable
+from typing import Optional, Any
+
+
+class ThreadPool:
+    """A bounded thread pool for running the synchronous (blocking) functions without blocking the event loop."""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """
+        Initialize the thread pool.
+
+        :param max_workers: Maximum number of the threads (the default is the number of CPUs + 4, at most 32)
+        """
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._max_queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the thread pool metrics, including the current ``queue_depth`` (the calls waiting for a free
+        thread) and its ``max_queue_depth``, the number of ``running`` and ``completed`` calls, the
+        ``total_wait_time`` and ``max_wait_time`` of the calls in the queue in seconds, and ``max_workers``.
+        """
+        return {'queue_depth': self._queued,
+                'max_queue_depth': self._max_queued,
+                'running': self._running,
+                'completed': self._completed,
+                'total_wait_time': self._total_wait_time,
+                'max_wait_time': self._max_wait_time,
+                'max_workers': self.max_workers}
+
+    async def run(self, func: callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a synchronous function in the thread pool and return its result.
+
+        The context variables (such as the current request) are copied to the thread.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='backendpy')
+        context = contextvars.copy_context()
+        with self._lock:
+            self._queued += 1
+            if self._queued > self._max_queued:
+                self._max_queued = self._queued
+        future = self._executor.submit(self._call, time.perf_counter(), context.run, func, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future):
+        if future.cancelled():
+            # The call is cancelled (e.g. by its awaiting task) before it is started
+            with self._lock:
+                self._queued -= 1
+
+    def _call(self, submit_time, func, *args, **kwargs):
+        wait_time = time.perf_counter() - submit_time
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._total_wait_time += wait_time
+            if wait_time > self._max_wait_time:
+                self._max_wait_time = wait_time
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def shutdown(self) -> None:
+        """Shut down the threads of the pool (without waiting for the running calls)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_default_thread_pool: Optional[ThreadPool] = None
+
+
+def get_thread_pool() -> ThreadPool:
+    """Return the default thread pool (which is set by the project)."""
+    global _default_thread_pool
+    if _default_thread_pool is None:
+        _default_thread_pool = ThreadPool()
+    return _default_thread_pool
+
+
+def set_thread_pool(thread_pool: ThreadPool) -> None:
+    """Set the default thread pool."""
+    global _default_thread_pool
+    _default_thread_pool = thread_pool
+
+
+def to_async(func: callable) -> callable:
+    """
+    Return an async version of a function. If the function is synchronous, the returned function
+    runs it in the default thread pool (and awaits its result if it is awaitable), otherwise the
+    function itself is returned.
+    """
+    if iscoroutinefunction(func) or iscoroutinefunction(getattr(func, '__call__', None)):
+        return func
+
+    @functools.wraps(func)
+    async def async_func(*args, **kwargs):
+        result = await get_thread_pool().run(func, *args, **kwargs)
+        if isawaitable(result):
+            result = await result
+        return result
+
+    async_func.sync_func = func
+    return async_func
@@ -1,5 +1,6 @@
 import urllib.parse
 import http.client
+import time
 from typing import Optional
 
 from .json import to_json, from_json
@@ -11,14 +12,28 @@ class Client:
             base_url: str,
             port: Optional[int] = None,
             ssl: Optional[bool] = False,
-            timeout: int = 10):
+            timeout: int = 10,
+            deadline: Optional[float] = None):
+        """
+        Initialize the client.
+
+        :param timeout: Timeout of the operations in seconds
+        :param deadline: The time (in :func:`time.monotonic` clock) that the time budget of the calls ends,
+                         which limits the timeout (e.g. the ``deadline`` of a request)
+        """
         self._base_url = base_url
         self._port = port
         self._ssl = ssl
         self._timeout = timeout
+        self._deadline = deadline
         self._session = None
 
     def __enter__(self):
+        if self._deadline is not None:
+            remaining_time = self._deadline - time.monotonic()
+            if remaining_time <= 0:
+                raise TimeoutError('The deadline of the calls is exceeded')
+            self._timeout = min(self._timeout, remaining_time)
         self._session = http.client.HTTPSConnection(
             host=self._base_url, port=self._port if self._port is not None else 443, timeout=self._timeout) \
             if self._ssl else http.client.HTTPConnection(
@@ -0,0 +1,96 @@
+"""
+Measure the per-request cost of the HTTP dispatch path of :class:`backendpy.Backendpy` (from the ASGI call
+to the sent response) for a minimal project.
+
+Usage::
+
+    $ python benchmarks/dispatch.py
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONFIG = """
+[networking]
+allowed_hosts =
+    localhost:8000
+    127.0.0.1:8000
+    example.com
+    *.example.com
+
+[apps]
+active =
+    benchproject.apps.hello
+"""
+
+APP = """
+from backendpy.app import App
+from backendpy.response import Text
+from backendpy.router import Routes
+
+routes = Routes()
+
+
+@routes.get('/hello')
+async def hello(request):
+    return Text('Hello', headers=[(b'X-Custom', b'1')])
+
+app = App(routes=[routes])
+"""
+
+MAIN = """
+from backendpy import Backendpy
+
+bp = Backendpy()
+"""
+
+
+def create_project(directory: str) -> None:
+    project_path = os.path.join(directory, 'benchproject')
+    app_path = os.path.join(project_path, 'apps', 'hello')
+    os.makedirs(app_path)
+    for path, content in ((os.path.join(project_path, '__init__.py'), ''),
+                          (os.path.join(project_path, 'apps', '__init__.py'), ''),
+                          (os.path.join(app_path, '__init__.py'), ''),
+                          (os.path.join(app_path, 'main.py'), APP),
+                          (os.path.join(project_path, 'main.py'), MAIN),
+                          (os.path.join(project_path, 'config.ini'), CONFIG)):
+        with open(path, 'w') as f:
+            f.write(content)
+
+
+async def run(bp, host: bytes, number: int) -> None:
+    scope = {'type': 'http', 'method': 'GET', 'path': '/hello', 'root_path': '', 'scheme': 'http',
+             'query_string': b'', 'server': ('127.0.0.1', 8000), 'client': ('127.0.0.1', 50000),
+             'headers': [(b'host', host), (b'user-agent', b'bench'), (b'accept', b'*/*')]}
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        pass
+
+    await bp(scope, receive, send)
+    start_time = time.perf_counter()
+    for _ in range(number):
+        await bp(scope, receive, send)
+    seconds = time.perf_counter() - start_time
+    print(f'host {host.decode():<16} | {seconds / number * 1e6:>6.1f} us/request')
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as temp_directory:
+        create_project(temp_directory)
+        sys.path.insert(0, temp_directory)
+        application = importlib.import_module('benchproject.main').bp
+        for request_host in (b'localhost:8000', b'api.example.com'):
+            asyncio.run(run(application, request_host, 20000))
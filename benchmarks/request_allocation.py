@@ -0,0 +1,76 @@
+"""
+Measure the per-request construction time and memory allocation of :class:`backendpy.request.Request`
+for the handlers that use none, some or all of the parsed request information.
+
+Usage::
+
+    $ python benchmarks/request_allocation.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backendpy.request import Request  # noqa: E402
+
+SCOPE = {
+    'type': 'http', 'method': 'GET', 'path': '/api/v1/items', 'root_path': '', 'scheme': 'https',
+    'query_string': b'page=2&size=50&sort=-created&tags[]=a&tags[]=b',
+    'server': ('127.0.0.1', 8000), 'client': ('10.0.0.1', 50000),
+    'headers': [
+        (b'host', b'api.example.com'),
+        (b'user-agent', b'Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0'),
+        (b'accept', b'application/json'),
+        (b'accept-language', b'en-US,en;q=0.5'),
+        (b'accept-encoding', b'gzip, deflate, br'),
+        (b'authorization', b'Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.e30.ZRrHA1JJJW8opsbCGfG_HACGpVUMN'),
+        (b'connection', b'keep-alive'),
+        (b'cookie', b'session=0123456789abcdef; theme=dark; lang=en'),
+        (b'x-forwarded-for', b'203.0.113.7'),
+        (b'x-request-id', b'6a1f0b0e-3f5c-4d8a-9d38-0f1c5e2b7a91'),
+        (b'cache-control', b'no-cache'),
+        (b'pragma', b'no-cache')]}
+
+
+def no_access():
+    request = Request(app=None, scope=SCOPE)
+    request.path
+    return request
+
+
+def some_access():
+    request = Request(app=None, scope=SCOPE)
+    request.headers.get('authorization')
+    return request
+
+
+def full_access():
+    request = Request(app=None, scope=SCOPE)
+    request.headers.items(), request.params, request.cookies, request.client, request.server, request.body
+    return request
+
+
+def measure_allocation(func, number: int = 1000) -> tuple[float, float]:
+    """Return the number of the memory blocks and bytes allocated per request that are kept by the request."""
+    kept = list()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    blocks_before = sum(s.count for s in tracemalloc.take_snapshot().statistics('filename'))
+    for _ in range(number):
+        kept.append(func())
+    after, _ = tracemalloc.get_traced_memory()
+    blocks_after = sum(s.count for s in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    return (blocks_after - blocks_before) / number, (after - before) / number
+
+
+if __name__ == '__main__':
+    for name, case in (('no access', no_access), ('one header', some_access), ('all data', full_access)):
+        seconds = timeit.timeit(case, number=100000)
+        blocks, size = measure_allocation(case)
+        print(f'{name:<10} | {seconds / 100000 * 1e9:>6.0f} ns/request | '
+              f'{blocks:>5.1f} blocks/request | {size:>6.0f} bytes/request')
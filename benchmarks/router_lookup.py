@@ -0,0 +1,47 @@
+"""
+Measure the per-request cost of :meth:`backendpy.router.Router.lookup`.
+
+Usage::
+
+    $ python benchmarks/router_lookup.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backendpy.router import Route, Router  # noqa: E402
+
+
+async def handler(request):
+    pass
+
+
+def build_router(size: int, cache_size: int = 0) -> Router:
+    router = Router(cache_size=cache_size, not_found_cache_size=cache_size)
+    for i in range(size):
+        if i % 2:
+            router.append(Route(f'/api/v1/resource{i}/items/<id:int>', ('GET',), handler))
+        else:
+            router.append(Route(f'/api/v1/resource{i}/items', ('GET',), handler))
+    return router
+
+
+def run(size: int, cache_size: int = 0, number: int = 100000) -> None:
+    router = build_router(size, cache_size)
+    cases = (
+        ('static', f'/api/v1/resource{size - 2}/items'),
+        ('dynamic', f'/api/v1/resource{size - 1}/items/42'),
+        ('not found', '/api/v1/unknown/items'))
+    for name, path in cases:
+        seconds = timeit.timeit(lambda: router.lookup(path, 'GET', 'http'), number=number)
+        print(f'{size:>6} routes | cache {cache_size:>5} | {name:<10} | {seconds / number * 1e9:>8.0f} ns/lookup')
+
+
+if __name__ == '__main__':
+    for routes_count in (1000, 10000):
+        run(routes_count)
+        run(routes_count, cache_size=1024)
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+from backendpy.admission import AdmissionController, Bulkhead
+from backendpy.unittest import AsyncTestCase
+
+
+class AdmissionControllerTestCase(AsyncTestCase):
+
+    async def test_queue(self):
+        controller = AdmissionController(max_concurrency=1, max_queue_size=1, max_queue_time=1)
+        self.assertTrue(await controller.acquire())
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        self.assertEqual(controller.stats['queued'], 1)
+        # The queue is full
+        self.assertFalse(await controller.acquire())
+        controller.release()
+        self.assertTrue(await waiter)
+        self.assertEqual(controller.stats['in_flight'], 1)
+        controller.release()
+        self.assertEqual(controller.stats['admitted'], 2)
+        self.assertEqual(controller.stats['rejected_queue_full'], 1)
+
+    async def test_queue_time(self):
+        controller = AdmissionController(max_concurrency=1, max_queue_time=0.01)
+        self.assertTrue(await controller.acquire())
+        self.assertFalse(await controller.acquire())
+        self.assertEqual(controller.stats['rejected_queue_time'], 1)
+        self.assertEqual(controller.stats['queued'], 0)
+        controller.release()
+        self.assertEqual(controller.stats['in_flight'], 0)
+
+    async def test_loop_lag(self):
+        controller = AdmissionController(max_concurrency=8, target_loop_lag=0.01, lag_interval=0.01)
+        controller.start()
+        await asyncio.sleep(0.02)
+        # Block the event loop
+        time.sleep(0.1)
+        await asyncio.sleep(0.005)
+        await controller.stop()
+        self.assertLess(controller.limit, 8)
+
+    async def test_max_loop_lag(self):
+        controller = AdmissionController(max_concurrency=8, max_loop_lag=0.05, exempt_paths=['/health'])
+        controller.loop_lag = 0.1
+        self.assertFalse(await controller.acquire())
+        self.assertEqual(controller.stats['rejected_loop_lag'], 1)
+        self.assertTrue(controller.is_exempt('/health'))
+
+
+class BulkheadTestCase(AsyncTestCase):
+
+    async def test_limit(self):
+        bulkhead = Bulkhead('reports', max_concurrency=1, max_queue_size=1)
+        self.assertTrue(await bulkhead.acquire())
+        waiter = asyncio.ensure_future(bulkhead.acquire())
+        await asyncio.sleep(0)
+        self.assertEqual(bulkhead.stats['queued'], 1)
+        self.assertFalse(await bulkhead.acquire())
+        bulkhead.release()
+        self.assertTrue(await waiter)
+        bulkhead.release()
+        self.assertEqual(bulkhead.stats['running'], 0)
+        self.assertEqual(bulkhead.stats['rejected_queue_full'], 1)
+
+    async def test_priority(self):
+        low = Bulkhead('low', max_concurrency=2, priority='low')
+        normal = Bulkhead('normal', max_concurrency=1, max_queue_size=1, max_queue_time=0.01)
+        high = Bulkhead('high', max_concurrency=1, max_queue_size=1, max_queue_time=0.01, priority='high')
+        self.assertFalse(await low.acquire(saturated=True))
+        self.assertTrue(await normal.acquire(saturated=True))
+        self.assertFalse(await normal.acquire(saturated=True))
+        self.assertEqual(normal.stats['rejected_shed'], 1)
+        self.assertTrue(await high.acquire(saturated=True))
+        # The high priority requests wait in the queue
+        self.assertFalse(await high.acquire(saturated=True))
+        self.assertEqual(high.stats['rejected_queue_time'], 1)
+        self.assertEqual(high.stats['rejected_shed'], 0)
+        with self.assertRaises(ValueError):
+            Bulkhead('invalid', max_concurrency=1, priority='urgent')
@@ -0,0 +1,320 @@
+import asyncio
+import gc
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import warnings
+
+from backendpy.unittest import AsyncTestCase
+
+MAIN = """
+from backendpy import Backendpy
+
+bp = Backendpy()
+"""
+
+APP = """
+import asyncio
+
+from backendpy.app import App
+from backendpy.response import Text
+from backendpy.router import Routes
+
+routes = Routes()
+events = []
+
+
+@routes.get('/hello')
+async def hello(request):
+    return Text('Hello')
+
+
+@routes.get('/slow')
+async def slow(request):
+    async def task():
+        await asyncio.sleep(0.05)
+        events.append('background task')
+
+    await asyncio.sleep(0.05)
+    request.add_background_task(task())
+    events.append('request')
+    return Text('Slow')
+
+
+async def legacy_app(scope, receive, send):
+    if scope['path'] == '/slow':
+        await asyncio.sleep(0.05)
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': scope['root_path'].encode() + b' ' + scope['raw_path']})
+
+routes.mount('/legacy', legacy_app)
+
+app = App(routes=[routes])
+"""
+
+SHOP_APP = """
+import asyncio
+
+from backendpy.app import App
+from backendpy.hook import Hooks
+from backendpy.response import Text
+from backendpy.router import Routes
+
+routes = Routes()
+hooks = Hooks()
+events = []
+
+
+@routes.get('/shop/items')
+async def items(request):
+    return Text('Items')
+
+
+@hooks.event('startup')
+async def on_startup():
+    events.append('startup')
+
+
+@hooks.event('startup', concurrent=True, timeout=0.01)
+async def stuck():
+    await asyncio.sleep(1)
+
+app = App(routes=[routes], hooks=[hooks])
+"""
+
+
+def create_project(directory, name, config, apps):
+    """Create a project package with the config and the apps (a mapping of the app names to their main modules)
+    in the directory and return its Backendpy application."""
+    project_path = os.path.join(directory, name)
+    files = {'__init__.py': '', 'main.py': MAIN, 'config.ini': config, os.path.join('apps', '__init__.py'): ''}
+    for app_name, content in apps.items():
+        files[os.path.join('apps', app_name, '__init__.py')] = ''
+        files[os.path.join('apps', app_name, 'main.py')] = content
+    for path, content in files.items():
+        path = os.path.join(project_path, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    return importlib.import_module(f'{name}.main').bp
+
+
+async def call(bp, path, method='GET', headers=None, raw_path=None, disconnected=False):
+    """Send an HTTP request to the application and return the response status, headers and body
+    (sending the response fails if the client is disconnected)."""
+    scope = {'type': 'http', 'method': method, 'path': path, 'raw_path': raw_path or path.encode(),
+             'root_path': '', 'scheme': 'http', 'query_string': b'', 'server': ('127.0.0.1', 8000),
+             'client': ('127.0.0.1', 50000),
+             'headers': headers if headers is not None else [(b'host', b'localhost:8000')]}
+    messages = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # The client is connected until the response is sent
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if disconnected:
+            raise OSError('Connection reset')
+        messages.append(message)
+
+    await bp(scope, receive, send)
+    start = next(m for m in messages if m['type'] == 'http.response.start')
+    body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+    return start['status'], dict(start['headers']), body
+
+
+async def lifespan(bp, *message_types):
+    """Send the lifespan messages to the application and return the types of the sent messages."""
+    messages = asyncio.Queue()
+    for message_type in message_types:
+        messages.put_nowait({'type': message_type})
+    sent = []
+
+    async def send(message):
+        sent.append(message['type'])
+        if len(sent) == len(message_types):
+            task.cancel()
+
+    task = asyncio.ensure_future(bp({'type': 'lifespan'}, messages.get, send))
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return sent
+
+
+class ProjectTestCase(AsyncTestCase):
+    """Base class of the test cases that use a temporary project."""
+
+    name = None
+    config = ''
+    allowed_hosts = ('localhost:8000',)
+    apps = {'hello': APP}
+    lazy_apps = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        config = '[networking]\nallowed_hosts =\n' + ''.join(f'    {host}\n' for host in cls.allowed_hosts) + \
+                 '[apps]\nactive =\n' + ''.join(f'    {cls.name}.apps.{app}\n' for app in cls.apps)
+        if cls.lazy_apps:
+            config += 'lazy =\n' + ''.join(f'    {cls.name}.apps.{app} {prefix}\n'
+                                             for app, prefix in cls.lazy_apps.items())
+        config += cls.config
+        cls.bp = create_project(cls.directory, cls.name, config, cls.apps)
+
+    @classmethod
+    def tearDownClass(cls):
+        if not cls.bp._shutting_down:
+            asyncio.get_event_loop().run_until_complete(lifespan(cls.bp, 'lifespan.shutdown'))
+        sys.path.remove(cls.directory)
+        shutil.rmtree(cls.directory)
+
+
+class StartupTestCase(ProjectTestCase):
+    name = 'startupproject'
+
+    async def test_concurrent_first_requests(self):
+        calls = []
+
+        @self.bp.event('startup')
+        async def on_startup():
+            calls.append(True)
+            await asyncio.sleep(0.01)
+
+        responses = await asyncio.gather(*(call(self.bp, '/hello') for _ in range(3)))
+        self.assertEqual([status for status, _, _ in responses], [200, 200, 200])
+        self.assertEqual(calls, [True])
+
+
+class AllowedHostsTestCase(ProjectTestCase):
+    name = 'hostsproject'
+    allowed_hosts = ('localhost:8000', '*.example.com')
+
+    async def test_allowed_hosts(self):
+        for host, status in ((b'localhost:8000', 200),
+                             (b'localhost', 400),
+                             (b'api.example.com', 200),
+                             (b'API.Example.com:8443', 200),
+                             (b'example.com', 400),
+                             (b'evil.com/.example.com', 400),
+                             (b'evil.com?.example.com', 400),
+                             (b'evil.com:.example.com', 400),
+                             (b'', 400)):
+            with self.subTest(host=host):
+                response = await call(self.bp, '/hello', headers=[(b'host', host)])
+                self.assertEqual(response[0], status)
+                if status == 400:
+                    self.assertIn(b'"code": 1003', response[2])
+        response = await call(self.bp, '/hello', headers=[(b'host', b'api.example.com'),
+                                                          (b'x-forwarded-host', b'evil.com, a.example.com')])
+        self.assertEqual(response[0], 400)
+
+
+class MountTestCase(ProjectTestCase):
+    name = 'mountproject'
+
+    async def test_raw_path(self):
+        status, _, body = await call(self.bp, '/legacy/a b/c', raw_path=b'/legacy/a%20b/c')
+        self.assertEqual((status, body), (200, b'/legacy /a%20b/c'))
+        status, _, body = await call(self.bp, '/legacy/a/b', raw_path=b'/leg%61cy/a%2Fb')
+        self.assertEqual((status, body), (200, b'/legacy /a%2Fb'))
+        status, _, body = await call(self.bp, '/legacy', raw_path=b'/legacy')
+        self.assertEqual((status, body), (200, b'/legacy /'))
+
+    async def test_in_flight(self):
+        task = asyncio.ensure_future(call(self.bp, '/legacy/slow'))
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(self.bp._in_flight_requests), 1)
+        self.assertEqual(await task, (200, {}, b'/legacy /slow'))
+        self.assertEqual(len(self.bp._in_flight_requests), 0)
+
+
+class LazyAppTestCase(ProjectTestCase):
+    name = 'lazyproject'
+    apps = {'hello': APP, 'shop': SHOP_APP}
+    lazy_apps = {'shop': '/shop'}
+
+    async def test_first_request(self):
+        self.assertNotIn('lazyproject.apps.shop.main', sys.modules)
+        self.assertEqual(await call(self.bp, '/hello'), (200, {b'content-type': b'text/plain',
+                                                                b'content-length': b'5'}, b'Hello'))
+        self.assertNotIn('lazyproject.apps.shop.main', sys.modules)
+        status, _, body = await call(self.bp, '/shop/items')
+        self.assertEqual((status, body), (200, b'Items'))
+        self.assertIn('lazyproject.apps.shop.main', sys.modules)
+        self.assertIn('lazyproject.apps.shop', self.bp.lazy_load_times)
+        # The startup hooks of the app are executed by the hook runner like the hooks of the other apps
+        self.assertEqual(sys.modules['lazyproject.apps.shop.main'].events, ['startup'])
+        self.assertEqual(self.bp.hook_stats[('startup', 'lazyproject.apps.shop.main.stuck')]['timeouts'], 1)
+        status, _, body = await call(self.bp, '/shop/items')
+        self.assertEqual((status, body), (200, b'Items'))
+
+
+class ShutdownTestCase(ProjectTestCase):
+    name = 'shutdownproject'
+
+    async def test_graceful_shutdown(self):
+        events = sys.modules['shutdownproject.apps.hello.main'].events
+
+        @self.bp.event('shutdown')
+        async def on_shutdown():
+            events.append('shutdown')
+
+        request = asyncio.ensure_future(call(self.bp, '/slow'))
+        await asyncio.sleep(0.01)
+        shutdown = asyncio.ensure_future(lifespan(self.bp, 'lifespan.shutdown'))
+        await asyncio.sleep(0.01)
+        # New requests are rejected during the shutdown
+        status, headers, body = await call(self.bp, '/hello')
+        self.assertEqual(status, 503)
+        self.assertEqual(headers[b'connection'], b'close')
+        self.assertIn(b'"code": 1006', body)
+        self.assertEqual(await request, (200, {b'content-type': b'text/plain', b'content-length': b'4'}, b'Slow'))
+        self.assertEqual(await shutdown, ['lifespan.shutdown.complete'])
+        # The in-flight requests and then the background tasks are done before the shutdown hooks
+        self.assertEqual(events, ['request', 'background task', 'shutdown'])
+        self.assertEqual(self.bp.request_stats['rejected_shutdown'], 1)
+        self.assertEqual(self.bp.request_stats['rejected_overload'], 0)
+
+
+class BackgroundTaskTestCase(ProjectTestCase):
+    name = 'backgroundproject'
+
+    async def test_failed_response(self):
+        events = sys.modules['backgroundproject.apps.hello.main'].events
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            with self.assertRaises(OSError):
+                await call(self.bp, '/slow', disconnected=True)
+            gc.collect()
+        # The background task of the failed request is closed without being executed
+        self.assertEqual([str(w.message) for w in caught if issubclass(w.category, RuntimeWarning)], [])
+        await asyncio.sleep(0.1)
+        self.assertEqual(events, ['request'])
+        with self.assertRaises(LookupError):
+            self.bp.get_current_request()
+
+
+class AdmissionTestCase(ProjectTestCase):
+    name = 'admissionproject'
+    config = '[admission]\nmax_concurrency = 1\nmin_concurrency = 1\nmax_queue_time = 0.01\n'
+
+    async def test_overload(self):
+        request = asyncio.ensure_future(call(self.bp, '/slow'))
+        await asyncio.sleep(0.01)
+        status, headers, body = await call(self.bp, '/hello')
+        self.assertEqual(status, 503)
+        self.assertIn(b'"code": 1006', body)
+        self.assertEqual((await request)[0], 200)
+        self.assertEqual(self.bp.request_stats['rejected_overload'], 1)
+        self.assertEqual(self.bp.request_stats['rejected_shutdown'], 0)
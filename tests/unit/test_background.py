@@ -0,0 +1,47 @@
+import asyncio
+
+from backendpy.background import BackgroundTaskQueue
+from backendpy.unittest import AsyncTestCase
+
+
+class BackgroundTaskQueueTestCase(AsyncTestCase):
+
+    async def test_drain(self):
+        done = []
+
+        async def task(value):
+            await asyncio.sleep(0.01)
+            if value == 3:
+                raise RuntimeError
+            done.append(value)
+
+        queue = BackgroundTaskQueue(max_size=2, workers=2)
+        for i in range(5):
+            await queue.put(task(i))
+        self.assertLessEqual(queue.stats['max_depth'], 2)
+        self.assertEqual(await queue.stop(), 0)
+        self.assertEqual(sorted(done), [0, 1, 2, 4])
+        self.assertEqual(queue.stats['completed'], 4)
+        self.assertEqual(queue.stats['failed'], 1)
+
+    async def test_stop_timeout(self):
+        queue = BackgroundTaskQueue(max_size=10, workers=1)
+        for _ in range(3):
+            await queue.put(asyncio.sleep(1))
+        self.assertEqual(await queue.stop(timeout=0.01), 3)
+        self.assertEqual(queue.stats['depth'], 0)
+
+    async def test_put_after_stop(self):
+        done = []
+
+        async def task():
+            done.append(True)
+
+        queue = BackgroundTaskQueue(max_size=10, workers=1)
+        await queue.put(task())
+        await queue.stop()
+        await queue.put(task())
+        await asyncio.sleep(0.01)
+        self.assertFalse(queue.is_started)
+        self.assertEqual(done, [True])
+        self.assertEqual(queue.stats['rejected'], 1)
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from backendpy.middleware.defaults.cors import CORSMiddleware
+from backendpy.response import Response
+from backendpy.unittest import AsyncTestCase
+
+CONFIG = {'cors': {
+    'allowed_origins': ('https://Example.com',),
+    'allowed_methods': ('get', 'post'),
+    'allowed_headers': ('Authorization', 'Content-Type'),
+    'allow_credentials': 'true',
+    'preflight_cache_size': '1'}}
+
+
+def make_request(method, headers):
+    return SimpleNamespace(method=method, headers=headers, app=SimpleNamespace(config=CONFIG))
+
+
+class CORSMiddlewareTestCase(AsyncTestCase):
+
+    async def test_preflight(self):
+        middleware = CORSMiddleware()
+        headers = {'origin': 'https://example.com',
+                   'access-control-request-method': 'POST',
+                   'access-control-request-headers': 'authorization, x-other'}
+        _, response = await middleware.process_request(make_request('OPTIONS', headers))
+        self.assertEqual(response.headers, [
+            (b'access-control-allow-origin', b'https://example.com'),
+            (b'access-control-allow-methods', b'GET, POST'),
+            (b'access-control-allow-headers', b'authorization'),
+            (b'access-control-allow-credentials', b'true'),
+            (b'access-control-max-age', b'86400'),
+            (b'vary', b'origin')])
+        _, cached_response = await middleware.process_request(make_request('OPTIONS', headers))
+        self.assertEqual(cached_response.headers, response.headers)
+        _, response = await middleware.process_request(make_request('OPTIONS', {'origin': 'https://other.com'}))
+        self.assertEqual(response.headers, [(b'vary', b'origin')])
+        self.assertEqual(len(middleware._preflight_cache), 1)
+
+    async def test_response(self):
+        middleware = CORSMiddleware()
+        response = Response(body=b'', headers=[[b'vary', b'accept-encoding']])
+        response = await middleware.process_response(
+            make_request('GET', {'origin': 'https://example.com', 'cookie': 'a=1'}), response)
+        self.assertEqual(response.headers, [
+            (b'vary', b'accept-encoding, origin'),
+            (b'access-control-allow-origin', b'https://example.com'),
+            (b'access-control-allow-credentials', b'true')])
@@ -0,0 +1,39 @@
+import uuid
+
+from backendpy.data_handler import validators as v
+from backendpy.data_handler.data import Data
+from backendpy.data_handler.fields import String, TYPE_URL_VAR
+from backendpy.request import Request
+from backendpy.router import Route, Router
+from backendpy.unittest import AsyncTestCase
+
+SCOPE = {'type': 'http', 'method': 'GET', 'path': '/', 'root_path': '', 'scheme': 'http',
+         'query_string': b'', 'headers': []}
+
+
+async def handler(request):
+    pass
+
+
+class ItemData(Data):
+    id = String('id', field_type=TYPE_URL_VAR, processors=[v.UUID()])
+    page = String('page', field_type=TYPE_URL_VAR, processors=[v.Length(max=3), v.Integer()])
+
+
+class DataTestCase(AsyncTestCase):
+
+    async def test_typed_url_vars(self):
+        router = Router()
+        router.append(Route('/items/<id:uuid>/<page:int>', ('GET',), handler))
+        item_id = uuid.uuid4()
+        _, _, url_vars = router.lookup(f'/items/{item_id}/12', 'GET', 'http')
+        self.assertEqual(url_vars, {'id': item_id, 'page': 12})
+        request = Request(app=None, scope=SCOPE, url_vars=url_vars)
+        cleaned_data, errors = await ItemData().get_cleaned_data(request)
+        self.assertEqual(errors, {})
+        self.assertEqual(cleaned_data, {'id': str(item_id), 'page': '12'})
+
+        _, _, url_vars = router.lookup(f'/items/{item_id}/1234', 'GET', 'http')
+        request = Request(app=None, scope=SCOPE, url_vars=url_vars)
+        cleaned_data, errors = await ItemData().get_cleaned_data(request)
+        self.assertEqual(list(errors), ['page'])
@@ -0,0 +1,112 @@
+import asyncio
+
+from backendpy.hook import HookRunner, Hooks
+from backendpy.middleware.middleware import Middleware, MiddlewareProcessor
+from backendpy.unittest import AsyncTestCase
+
+
+class RequestMiddleware(Middleware):
+
+    @staticmethod
+    async def process_request(request):
+        request['middlewares'].append('request')
+        return request, None
+
+
+class ResponseMiddleware(Middleware):
+
+    async def process_response(self, request, response):
+        return response + 1
+
+
+class MiddlewareProcessorTestCase(AsyncTestCase):
+
+    def setUp(self):
+        self.processor = MiddlewareProcessor()
+        self.processor._middlewares = [RequestMiddleware(), ResponseMiddleware(), ResponseMiddleware()]
+        self.processor.compile()
+
+    def test_compile(self):
+        self.assertEqual(len(self.processor.request_processors), 1)
+        self.assertEqual(self.processor.handler_processors, ())
+        self.assertEqual(len(self.processor.response_processors), 2)
+
+    async def test_run(self):
+        request, response = await self.processor.run_process_request({'middlewares': []})
+        self.assertEqual(request['middlewares'], ['request'])
+        self.assertIsNone(response)
+        self.assertEqual(await self.processor.run_process_response(request, 0), 2)
+
+
+class HookRunnerTestCase(AsyncTestCase):
+
+    async def test_trigger(self):
+        calls = []
+
+        async def hook(value):
+            calls.append(value)
+
+        runner = HookRunner()
+        runner.hooks.register('start', hook)
+        self.assertTrue(runner.has_hooks('start'))
+        self.assertFalse(runner.has_hooks('end'))
+        await runner.trigger('start', {'value': 1})
+        await runner.trigger('end')
+        runner.hooks.register('end', hook)
+        runner.compile()
+        await runner.trigger('end', {'value': 2})
+        self.assertEqual(calls, [1, 2])
+
+    async def test_concurrent_trigger(self):
+        calls = []
+
+        async def slow(value):
+            await asyncio.sleep(0.02)
+            calls.append(('slow', value))
+
+        async def failing(value):
+            raise RuntimeError
+
+        async def stuck(value):
+            await asyncio.sleep(1)
+
+        runner = HookRunner()
+        hooks = Hooks()
+        hooks.register('end', slow, concurrent=True)
+        hooks.register('end', failing, concurrent=True)
+        hooks.register('end', stuck, concurrent=True, timeout=0.01)
+        runner.hooks.merge(hooks)
+        await runner.trigger('end', {'value': 1})
+        self.assertEqual(calls, [('slow', 1)])
+        stats = {hook_name.rsplit('.', 1)[1]: item for (_, hook_name), item in runner.stats.items()}
+        self.assertEqual(stats['failing']['errors'], 1)
+        self.assertEqual(stats['stuck']['timeouts'], 1)
+        self.assertGreater(stats['slow']['max_time'], 0)
+
+    async def test_trigger_hooks(self):
+        calls = []
+        runner = HookRunner()
+        hooks = Hooks()
+        hooks.register('start', lambda: calls.append('app'), concurrent=True)
+        runner.hooks.register('start', lambda: calls.append('project'))
+        runner.hooks.merge(hooks)
+        await runner.trigger('start', hooks=[hooks])
+        self.assertEqual(calls, ['app'])
+        self.assertEqual(len(runner.stats), 1)
+
+    async def test_callable_instance_hook(self):
+        class Hook:
+            def __init__(self):
+                self.calls = 0
+
+            async def __call__(self):
+                self.calls += 1
+
+        hook = Hook()
+        runner = HookRunner()
+        runner.hooks.register('start', hook, concurrent=True)
+        runner.hooks.register('start', Hook(), concurrent=True)
+        await runner.trigger('start')
+        self.assertEqual(hook.calls, 1)
+        self.assertEqual(runner.stats[('start', f'{__name__}.HookRunnerTestCase.test_callable_instance_hook.'
+                                                f'<locals>.Hook')]['calls'], 2)
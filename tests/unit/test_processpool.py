@@ -0,0 +1,52 @@
+import asyncio
+import os
+import time
+
+from backendpy.processpool import ProcessPool
+from backendpy.unittest import AsyncTestCase
+
+
+def double(data, suffix=b''):
+    return data * 2 + suffix
+
+
+def slow_double(data):
+    time.sleep(0.1)
+    return data * 2
+
+
+def shared_memory_blocks():
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
+
+class ProcessPoolTestCase(AsyncTestCase):
+
+    async def test_run(self):
+        pool = ProcessPool(max_workers=1, shared_memory_threshold=10)
+        try:
+            self.assertEqual(await pool.run(double, b'abc'), b'abcabc')
+            # Large arguments and results are transferred through shared memory
+            self.assertEqual(await pool.run(double, b'x' * 20, suffix=b'!'), b'x' * 40 + b'!')
+            with self.assertRaises(ValueError):
+                await pool.run(int, 'x')
+            self.assertEqual(pool.stats['completed'], 2)
+            self.assertEqual(pool.stats['failed'], 1)
+        finally:
+            pool.stop()
+
+    async def test_cancelled_caller(self):
+        pool = ProcessPool(max_workers=1, shared_memory_threshold=10)
+        try:
+            # Start the worker process
+            await pool.run(double, b'a')
+            blocks = shared_memory_blocks()
+            task = asyncio.ensure_future(pool.run(slow_double, b'x' * 20))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.2)
+            # The shared memory blocks of the argument and the result are released
+            self.assertEqual(shared_memory_blocks(), blocks)
+        finally:
+            pool.stop()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+from types import SimpleNamespace
+
+from backendpy.middleware.defaults.ratelimit import RateLimitMiddleware, SharedTokenBucketStore, TokenBucketStore
+from backendpy.unittest import AsyncTestCase, TestCase
+
+CONFIG = {'rate_limit': {'rate': '1', 'burst': '2', 'key': 'user'},
+          'environment': {'project_path': '/tmp/project'}}
+
+
+def make_request(ip, user_id=None, config=CONFIG):
+    return SimpleNamespace(method='GET', path='/', client={'ip': ip, 'port': 1},
+                           context={'user_id': user_id} if user_id else {}, app=SimpleNamespace(config=config))
+
+
+class TokenBucketStoreTestCase(TestCase):
+
+    def test_consume(self):
+        store = TokenBucketStore(rate=1, burst=2)
+        self.assertEqual(store.consume('a'), 0)
+        self.assertEqual(store.consume('a'), 0)
+        self.assertGreater(store.consume('a'), 0.9)
+        self.assertEqual(store.consume('b'), 0)
+
+    def test_eviction(self):
+        store = TokenBucketStore(rate=1, burst=1, max_size=4, shards=1)
+        for i in range(10):
+            store.consume(str(i))
+        self.assertEqual(len(store), 4)
+        store.ttl = 0
+        store.consume('new')
+        self.assertEqual(len(store), 1)
+
+    def test_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ratelimit.bin')
+            store = SharedTokenBucketStore(rate=1, burst=2, path=path, max_size=64, shards=4)
+            other_store = SharedTokenBucketStore(rate=1, burst=2, path=path, max_size=64, shards=4)
+            self.assertEqual(store.consume('a'), 0)
+            self.assertEqual(other_store.consume('a'), 0)
+            self.assertGreater(store.consume('a'), 0.9)
+            self.assertEqual(other_store.consume('b'), 0)
+            store.close()
+            other_store.close()
+
+
+class RateLimitMiddlewareTestCase(AsyncTestCase):
+
+    async def test_process_request(self):
+        middleware = RateLimitMiddleware()
+        for _ in range(2):
+            _, response = await middleware.process_request(make_request('1.1.1.1', 'u1'))
+            self.assertIsNone(response)
+        _, response = await middleware.process_request(make_request('2.2.2.2', 'u1'))
+        self.assertEqual(response.code, 1007)
+        self.assertEqual(response.headers, [(b'retry-after', b'1'), (b'ratelimit-limit', b'2'),
+                                            (b'ratelimit-policy', b'2;w=2')])
+        # Anonymous requests are limited by the client IP address
+        _, response = await middleware.process_request(make_request('2.2.2.2'))
+        self.assertIsNone(response)
+
+    async def test_shared_routes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = {'rate_limit': {'shared': 'true', 'shared_path': os.path.join(directory, 'ratelimit.bin')},
+                      'environment': {'project_path': directory}}
+            # The middlewares of two routes with the same settings
+            items_middleware = RateLimitMiddleware(rate=1, burst=1)
+            orders_middleware = RateLimitMiddleware(rate=1, burst=1)
+            # And of a route in another worker process
+            other_items_middleware = RateLimitMiddleware(rate=1, burst=1, name=items_middleware._name)
+            for middleware in (items_middleware, orders_middleware):
+                _, response = await middleware.process_request(make_request('1.1.1.1', config=config))
+                self.assertIsNone(response)
+            _, response = await other_items_middleware.process_request(make_request('1.1.1.1', config=config))
+            self.assertEqual(response.code, 1007)
+            for middleware in (items_middleware, orders_middleware, other_items_middleware):
+                middleware._store.close()
@@ -0,0 +1,83 @@
+import asyncio
+
+from backendpy.request import DisconnectWatcher, Headers, Request
+from backendpy.unittest import AsyncTestCase, TestCase
+
+SCOPE = {'type': 'http', 'method': 'GET', 'path': '/items', 'root_path': '', 'scheme': 'https',
+         'query_string': b'page=2&tags[]=a&tags[]=b', 'server': ('127.0.0.1', 8000), 'client': ('10.0.0.1', 50000),
+         'headers': [(b'host', b'example.com'), (b'accept', b'text/html'), (b'accept', b'application/json'),
+                     (b'cookie', b'session=abc; theme="dark"'), (b'content-type', b'application/json')]}
+
+
+class RequestTestCase(TestCase):
+
+    def test_lazy_scope_data(self):
+        request = Request(app=None, scope=SCOPE)
+        self.assertIsNone(request._headers)
+        self.assertIsNone(request._params)
+        self.assertEqual(request.params, {'page': '2', 'tags[]': ['a', 'b']})
+        self.assertEqual(request.cookies, {'session': 'abc', 'theme': 'dark'})
+        self.assertEqual(request.client, {'ip': '10.0.0.1', 'port': 50000})
+        self.assertEqual(request.server, {'host': '127.0.0.1', 'port': 8000})
+        self.assertEqual(request.body._content_type, 'application/json')
+
+    def test_headers(self):
+        headers = Headers(SCOPE['headers'])
+        self.assertEqual(headers['Host'], 'example.com')
+        self.assertEqual(headers.get('accept'), 'application/json')
+        self.assertEqual(headers.getlist('Accept'), ['text/html', 'application/json'])
+        self.assertIn('Content-Type', headers)
+        self.assertNotIn('origin', headers)
+        self.assertIsNone(headers.get('origin'))
+        with self.assertRaises(KeyError):
+            headers['origin']
+        self.assertEqual(set(headers), {'host', 'accept', 'cookie', 'content-type'})
+
+    def test_assigned_headers(self):
+        request = Request(app=None, scope=SCOPE)
+        self.assertEqual(request.cookies, {'session': 'abc', 'theme': 'dark'})
+        request.headers = {**request.headers, 'Cookie': 'session=xyz', 'X-User-ID': '1'}
+        self.assertIsInstance(request.headers, Headers)
+        self.assertEqual(request.headers['x-user-id'], '1')
+        self.assertEqual(request.cookies, {'session': 'xyz'})
+        with self.assertRaises(TypeError):
+            request.headers['x-user-id'] = '2'
+        request.user = 'user'
+        self.assertEqual(request.user, 'user')
+
+
+class DisconnectWatcherTestCase(AsyncTestCase):
+
+    async def test_disconnect(self):
+        messages = [{'type': 'http.disconnect'},
+                    {'type': 'http.request', 'body': b'b', 'more_body': False},
+                    {'type': 'http.request', 'body': b'a', 'more_body': True}]
+
+        async def receive():
+            return messages.pop()
+
+        handler = asyncio.ensure_future(asyncio.sleep(1))
+        watcher = DisconnectWatcher(receive)
+        watcher.start(handler.cancel)
+        self.assertEqual((await watcher.receive())['body'], b'a')
+        self.assertEqual((await watcher.receive())['body'], b'b')
+        with self.assertRaises(asyncio.CancelledError):
+            await handler
+        self.assertTrue(watcher.disconnected)
+        watcher.stop()
+
+    async def test_disconnect_with_unread_body(self):
+        messages = [{'type': 'http.disconnect'}] + \
+                   [{'type': 'http.request', 'body': b'a', 'more_body': True} for _ in range(3)]
+
+        async def receive():
+            return messages.pop()
+
+        handler = asyncio.ensure_future(asyncio.sleep(1))
+        watcher = DisconnectWatcher(receive)
+        watcher.start(handler.cancel)
+        # The handler does not read the body
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(handler, 0.1)
+        self.assertTrue(watcher.disconnected)
+        watcher.stop()
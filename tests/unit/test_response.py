@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+
+from backendpy.response import Text
+from backendpy.unittest import AsyncTestCase
+
+
+class ResponseTestCase(AsyncTestCase):
+
+    async def test_headers(self):
+        response = Text('Hello', headers=[(b'X-Custom', b'1'), ('Cache-Control', b'no-cache')])
+        _, _, headers, _ = await response(SimpleNamespace(method='GET'))
+        self.assertEqual([name for name, _ in headers],
+                         [b'x-custom', b'cache-control', b'content-type', b'content-length'])
+
+    async def test_head_compressed(self):
+        get_response = await Text('Hello' * 100, compress=True)(SimpleNamespace(method='GET'))
+        head_response = await Text('Hello' * 100, compress=True)(SimpleNamespace(method='HEAD'))
+        self.assertEqual(head_response[0], b'')
+        self.assertEqual(head_response[1:], get_response[1:])
+        self.assertIn([b'content-encoding', b'gzip'], head_response[2])
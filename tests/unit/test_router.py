@@ -0,0 +1,184 @@
+import uuid
+
+from backendpy.admission import Bulkhead
+from backendpy.router import Route, Router, Routes
+from backendpy.unittest import TestCase
+
+
+async def handler(request):
+    pass
+
+
+async def other_handler(request):
+    pass
+
+
+class RouterTestCase(TestCase):
+
+    def test_static_lookup(self):
+        router = Router()
+        router.append(Route('/users/posts', ('GET',), handler))
+        self.assertEqual(router.lookup('/users/posts', 'GET', 'http'), (handler, None, None))
+        self.assertEqual(router.lookup('/users/posts/', 'GET', 'http'), (handler, None, None))
+        self.assertEqual(router.lookup('/users/posts', 'POST', 'http'), (None, None, None))
+
+    def test_static_route_priority(self):
+        router = Router()
+        router.append(Route('/users/<id>', ('GET',), handler))
+        router.append(Route('/users/posts', ('GET',), other_handler))
+        self.assertEqual(router.lookup('/users/posts', 'GET', 'http'), (other_handler, None, None))
+        self.assertEqual(router.lookup('/users/abc', 'GET', 'http'), (handler, None, {'id': 'abc'}))
+
+    def test_static_only_ssl(self):
+        router = Router()
+        router.append(Route('/secure', ('GET',), handler, only_ssl=True))
+        self.assertEqual(router.lookup('/secure', 'GET', 'http'), (None, None, None))
+        self.assertEqual(router.lookup('/secure', 'GET', 'https'), (handler, None, None))
+
+    def test_overlapping_patterns_priority(self):
+        router = Router()
+        router.append(Route('/(a|b)/<n:int>', ('GET',), handler))
+        router.append(Route('/<v>/1', ('GET',), other_handler))
+        self.assertEqual(router.lookup('/a/1', 'GET', 'http'), (other_handler, None, {'v': 'a'}))
+        self.assertEqual(router.lookup('/a/2', 'GET', 'http'), (handler, None, {'n': 2}))
+
+    def test_partial_path_not_found(self):
+        router = Router()
+        router.append(Route('/a/b/c', ('GET',), handler))
+        self.assertEqual(router.lookup('/a/b/', 'GET', 'http'), (None, None, None))
+
+    def test_lookup_cache(self):
+        router = Router(cache_size=1, not_found_cache_size=1)
+        router.append(Route('/items/<id:int>', ('GET',), handler))
+        self.assertEqual(router.lookup('/items/1', 'GET', 'http'), (handler, None, {'id': 1}))
+        self.assertEqual(router.lookup('/items/1', 'GET', 'http'), (handler, None, {'id': 1}))
+        self.assertEqual(router.lookup('/items/2', 'GET', 'http'), (handler, None, {'id': 2}))
+        self.assertEqual(router.lookup('/unknown', 'GET', 'http'), (None, None, None))
+        self.assertEqual(router.lookup('/unknown', 'GET', 'http'), (None, None, None))
+        info = router.cache_info()
+        self.assertEqual((info['hits'], info['misses'], info['size']), (1, 3, 1))
+        self.assertEqual((info['not_found_hits'], info['not_found_size']), (1, 1))
+
+    def test_typed_url_vars(self):
+        router = Router()
+        router.append(Route('/items/<id:int>/<price:float>', ('GET',), handler))
+        router.append(Route('/users/<id:uuid>', ('GET',), handler))
+        self.assertEqual(router.lookup('/items/-3/1.5', 'GET', 'http'), (handler, None, {'id': -3, 'price': 1.5}))
+        user_id = uuid.uuid4()
+        self.assertEqual(router.lookup(f'/users/{user_id}', 'GET', 'http'), (handler, None, {'id': user_id}))
+
+    def test_path_url_var(self):
+        router = Router()
+        router.append(Route('/files/<file_path:path>', ('GET',), handler))
+        router.append(Route('/files/<name>/info', ('GET',), other_handler))
+        self.assertEqual(router.lookup('/files/a/b/c.png', 'GET', 'http'),
+                         (handler, None, {'file_path': 'a/b/c.png'}))
+        self.assertEqual(router.lookup('/files/a/info', 'GET', 'http'), (other_handler, None, {'name': 'a'}))
+        self.assertEqual(router.lookup('/files', 'GET', 'http'), (None, None, None))
+        with self.assertRaises(ValueError):
+            router.append(Route('/<p:path>/info', ('GET',), handler))
+
+    def test_head_fallback_to_get(self):
+        router = Router()
+        router.append(Route('/items/<id:int>', ('GET',), handler))
+        router.append(Route('/status', ('GET',), handler))
+        router.append(Route('/status', ('HEAD',), other_handler))
+        self.assertEqual(router.lookup('/items/1', 'HEAD', 'http'), (handler, None, {'id': 1}))
+        self.assertEqual(router.lookup('/status', 'HEAD', 'http'), (other_handler, None, None))
+
+    def test_method_not_allowed(self):
+        router = Router()
+        router.append(Route('/items/<id:int>', ('GET', 'DELETE'), handler))
+        router.append(Route('/items', ('POST',), handler))
+        self.assertEqual(router.resolve('/items/1', 'PUT', 'http'), (None, None, b'GET, DELETE, HEAD'))
+        self.assertEqual(router.resolve('/items', 'GET', 'http'), (None, None, b'POST'))
+        self.assertEqual(router.resolve('/unknown', 'GET', 'http'), (None, None, None))
+
+    def test_method_not_allowed_overlapping_routes(self):
+        router = Router()
+        router.append(Route('/a/<x>', ('GET',), handler))
+        router.append(Route('/a/b', ('POST',), handler))
+        router.append(Route('/a/<rest:path>', ('DELETE',), handler))
+        self.assertEqual(router.resolve('/a/b', 'PUT', 'http'), (None, None, b'GET, POST, DELETE, HEAD'))
+        self.assertEqual(router.resolve('/a/c', 'PUT', 'http'), (None, None, b'GET, DELETE, HEAD'))
+        self.assertEqual(router.resolve('/a/c/d', 'PUT', 'http'), (None, None, b'DELETE'))
+
+    def test_analyze(self):
+        router = Router()
+        router.append(Route('/users/<id:int>', ('GET',), handler))
+        router.append(Route('/users/<name>', ('GET',), handler))
+        router.append(Route('/users/me', ('GET',), handler))
+        router.append(Route('/users/<id:uuid>', ('GET',), handler))
+        report = {i['path']: i for i in router.analyze()['GET']}
+        self.assertEqual(report['/users/<id:int>']['overlaps'], [{'path': '/users/<name>', 'kind': 'ambiguous'}])
+        self.assertEqual(report['/users/me']['overlaps'], [{'path': '/users/<name>', 'kind': 'overlap'}])
+        self.assertEqual(report['/users/<id:uuid>']['overlaps'], [])
+        self.assertEqual(report['/users/<name>']['fan_out'], 3)
+
+    def test_host_routers(self):
+        router = Router()
+        router.append(Route('/shared', ('GET',), handler))
+        router.extend([Route('/home', ('GET',), handler)], hosts=('a.example.com',))
+        router.extend([Route('/home', ('GET',), other_handler)], hosts=('*.example.com',))
+        self.assertEqual(router.lookup('/home', 'GET', 'http', 'a.example.com:8000'), (handler, None, None))
+        self.assertEqual(router.lookup('/home', 'GET', 'http', 'x.y.example.com'), (other_handler, None, None))
+        self.assertEqual(router.lookup('/home', 'GET', 'http', 'example.com'), (None, None, None))
+        self.assertEqual(router.lookup('/shared', 'GET', 'http', 'b.example.com'), (handler, None, None))
+        self.assertEqual(router.lookup('/shared', 'GET', 'http', 'other.com'), (handler, None, None))
+
+    def test_route_hosts(self):
+        router = Router()
+        router.append(Route('/home', ('GET',), handler, hosts=('a.example.com',)))
+        router.extend([Route('/home', ('GET',), other_handler, hosts=('*.example.com',)),
+                       Route('/about', ('GET',), handler)], hosts=('a.example.com',))
+        self.assertEqual(router.lookup('/home', 'GET', 'http', 'a.example.com'), (handler, None, None))
+        self.assertEqual(router.lookup('/home', 'GET', 'http', 'b.example.com'), (other_handler, None, None))
+        self.assertEqual(router.lookup('/about', 'GET', 'http', 'a.example.com'), (handler, None, None))
+        self.assertEqual(router.lookup('/about', 'GET', 'http', 'b.example.com'), (None, None, None))
+        self.assertEqual(router.lookup('/home', 'GET', 'http', 'other.com'), (None, None, None))
+
+    def test_mounts(self):
+        router = Router()
+        routes = Routes()
+        routes.mount('/sub/', handler)
+        routes.mount('/sub/inner', other_handler)
+        router.extend(routes)
+        self.assertEqual(router.match_mount('/sub'), ('/sub', handler))
+        self.assertEqual(router.match_mount('/sub/a'), ('/sub', handler))
+        self.assertEqual(router.match_mount('/sub/inner/a'), ('/sub/inner', other_handler))
+        self.assertIsNone(router.match_mount('/subway'))
+        with self.assertRaises(ValueError):
+            router.mount('/sub', other_handler)
+
+    def test_route_middlewares(self):
+        class Audit:
+            pass
+
+        audit, auth, cache = Audit(), Audit(), Audit()
+        router = Router()
+        router.add_middlewares('/admin', [auth])
+        router.extend(Routes(Route('/admin/users', ('GET',), handler, middlewares=[cache]),
+                             middlewares=[audit]))
+        router.append(Route('/health', ('GET',), handler))
+        route, _, _ = router.resolve('/admin/users', 'GET', 'http')
+        self.assertEqual(route['middleware_processor'].middlewares, [auth, audit, cache])
+        route, _, _ = router.resolve('/health', 'GET', 'http')
+        self.assertIsNone(route['middleware_processor'])
+
+    def test_route_timeout(self):
+        router = Router()
+        router.extend(Routes(Route('/a', ('GET',), handler), Route('/b', ('GET',), handler, timeout=1),
+                             timeout=5))
+        self.assertEqual(router.resolve('/a', 'GET', 'http')[0]['timeout'], 5)
+        self.assertEqual(router.resolve('/b', 'GET', 'http')[0]['timeout'], 1)
+
+    def test_route_bulkhead(self):
+        reports, exports, app = Bulkhead('reports', 2), Bulkhead('exports', 1), Bulkhead('app', 4)
+        router = Router()
+        router.extend(Routes(Route('/a', ('GET',), handler), Route('/b', ('GET',), handler, bulkhead=exports),
+                             bulkhead=reports), bulkhead=app)
+        router.extend(Routes(Route('/c', ('GET',), handler)), bulkhead=app)
+        self.assertIs(router.resolve('/a', 'GET', 'http')[0]['bulkhead'], reports)
+        self.assertIs(router.resolve('/b', 'GET', 'http')[0]['bulkhead'], exports)
+        self.assertIs(router.resolve('/c', 'GET', 'http')[0]['bulkhead'], app)
+        self.assertEqual(router.bulkheads, [reports, exports, app])
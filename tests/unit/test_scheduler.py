@@ -0,0 +1,51 @@
+import asyncio
+import datetime
+import os
+import tempfile
+
+from backendpy.scheduler import CronSchedule, Scheduler, SchedulerRunner
+from backendpy.unittest import AsyncTestCase
+
+
+class CronScheduleTestCase(AsyncTestCase):
+
+    def test_get_next(self):
+        after = datetime.datetime(2026, 10, 17, 10, 7, 30)  # Saturday
+        self.assertEqual(CronSchedule('*/15 * * * *').get_next(after), datetime.datetime(2026, 10, 17, 10, 15))
+        self.assertEqual(CronSchedule('30 9 * * 1-5').get_next(after), datetime.datetime(2026, 10, 19, 9, 30))
+        self.assertEqual(CronSchedule('0 0 13 * 5').get_next(after), datetime.datetime(2026, 10, 23))
+        self.assertEqual(CronSchedule('5 4 29 2 *').get_next(after), datetime.datetime(2028, 2, 29, 4, 5))
+        with self.assertRaises(ValueError):
+            CronSchedule('60 * * * *')
+
+
+class SchedulerRunnerTestCase(AsyncTestCase):
+
+    async def test_run(self):
+        runs = []
+        scheduler = Scheduler()
+
+        @scheduler.every(0.01)
+        async def job():
+            runs.append(1)
+            await asyncio.sleep(0.03)
+
+        @scheduler.every(0.01, leader_only=True)
+        async def leader_job():
+            pass
+
+        lock_path = os.path.join(tempfile.mkdtemp(), 'scheduler.lock')
+        leader, other = SchedulerRunner(lock_path), SchedulerRunner(lock_path)
+        for runner in (leader, other):
+            runner.scheduler.merge(scheduler)
+            await runner.start()
+        await asyncio.sleep(0.1)
+        await leader.stop()
+        await other.stop()
+        stats = {name.rsplit('.', 1)[1]: item for name, item in leader.stats.items()}
+        # The runs of a job do not overlap
+        self.assertLessEqual(stats['job']['runs'], 3)
+        self.assertGreater(stats['leader_job']['runs'], 0)
+        other_stats = {name.rsplit('.', 1)[1]: item for name, item in other.stats.items()}
+        self.assertEqual(other_stats['leader_job']['runs'], 0)
+        self.assertGreater(other_stats['leader_job']['skipped'], 0)
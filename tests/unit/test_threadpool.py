@@ -0,0 +1,56 @@
+import asyncio
+import threading
+from contextvars import ContextVar
+
+from backendpy.hook import HookRunner
+from backendpy.threadpool import ThreadPool, set_thread_pool, to_async
+from backendpy.unittest import AsyncTestCase
+
+VAR = ContextVar('var')
+
+
+class ThreadPoolTestCase(AsyncTestCase):
+
+    async def test_run(self):
+        pool = ThreadPool(max_workers=2)
+        set_thread_pool(pool)
+
+        def blocking(value):
+            return value, VAR.get(), threading.current_thread() is threading.main_thread()
+
+        VAR.set('context')
+        self.assertEqual(await to_async(blocking)(1), (1, 'context', False))
+        self.assertEqual(pool.stats['completed'], 1)
+        self.assertEqual(pool.stats['queue_depth'], 0)
+        pool.shutdown()
+
+    async def test_cancel_queued_call(self):
+        pool = ThreadPool(max_workers=1)
+        event = threading.Event()
+        running = asyncio.ensure_future(pool.run(event.wait))
+        queued = asyncio.ensure_future(pool.run(event.wait))
+        await asyncio.sleep(0.01)
+        self.assertEqual(pool.stats['queue_depth'], 1)
+        queued.cancel()
+        await asyncio.sleep(0.01)
+        self.assertEqual(pool.stats['queue_depth'], 0)
+        event.set()
+        self.assertTrue(await running)
+        self.assertEqual(pool.stats['completed'], 1)
+        pool.shutdown()
+
+    async def test_awaitable_result(self):
+        async def coro_func(value):
+            return value
+
+        pool = ThreadPool(max_workers=1)
+        set_thread_pool(pool)
+        self.assertEqual(await to_async(lambda: coro_func(1))(), 1)
+        pool.shutdown()
+
+    async def test_sync_hook(self):
+        calls = []
+        runner = HookRunner()
+        runner.hooks.register('end', lambda value: calls.append(value))
+        await runner.trigger('end', {'value': 1})
+        self.assertEqual(calls, [1])